@@ -1,3 +1,4 @@
+from contextlib import contextmanager
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -11,3 +12,19 @@ def setup_driver():
     service = Service("/usr/bin/chromedriver")
     print("[DEBUG] Setting up Chrome WebDriver with specified options")
     return webdriver.Chrome(service=service, options=options)
+
+
+@contextmanager
+def managed_driver():
+    """
+    Start Chrome on entry and always quit it on exit.
+
+    Lets callers acquire a browser only when they actually scrape, instead of
+    holding one open for the life of the process.
+    """
+    driver = setup_driver()
+    try:
+        yield driver
+    finally:
+        print("[DEBUG] Quitting Chrome WebDriver")
+        driver.quit()
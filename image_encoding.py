@@ -0,0 +1,47 @@
+from io import BytesIO
+from PIL import Image
+
+# Twitter's size limit for a (non-GIF) image upload
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+
+
+def encode_for_upload(img, max_bytes=MAX_IMAGE_BYTES, quality=90):
+    """
+    Encode an image in the smallest format Twitter accepts at good quality.
+
+    Tries a palette-quantised PNG and high-quality WebP and JPEG (JPEG only for
+    images without transparency) and keeps the smallest that fits the limit.
+
+    Args:
+        img: PIL Image object
+        max_bytes (int): Largest acceptable encoded size
+        quality (int): JPEG/WebP quality
+
+    Returns:
+        tuple: (data, mime_type), or (None, None) if no encoding fits
+    """
+    has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+    rgb = img.convert("RGBA" if has_alpha else "RGB")
+
+    candidates = [
+        ("image/png", lambda buffer: rgb.quantize(
+            colors=256, method=Image.Quantize.FASTOCTREE).save(buffer, "PNG", optimize=True)),
+        ("image/webp", lambda buffer: rgb.save(buffer, "WEBP", quality=quality, method=4)),
+    ]
+    if not has_alpha:
+        candidates.append(
+            ("image/jpeg", lambda buffer: rgb.save(
+                buffer, "JPEG", quality=quality, optimize=True, progressive=True)))
+
+    best = (None, None)
+    for mime_type, save in candidates:
+        buffer = BytesIO()
+        try:
+            save(buffer)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Skipping {mime_type} encoding: {e}")
+            continue
+        data = buffer.getvalue()
+        if len(data) <= max_bytes and (best[0] is None or len(data) < len(best[0])):
+            best = (data, mime_type)
+    return best
@@ -0,0 +1,520 @@
+import os
+import json
+import math
+import mmap
+import time
+import struct
+import sqlite3
+import hashlib
+from job_card_parser import clean_job_link
+
+
+class PostedJobsJournal:
+    """
+    Append-only JSONL journal of posted jobs.
+
+    Each posted job costs one small appended line instead of a rewrite of the
+    whole history. Lines are flushed to the OS on every append, so a crashed
+    process loses nothing; fsync is batched across appends to bound what a power
+    loss can drop. Torn or duplicate lines are skipped when read; the
+    PostedJobsIndex counts them as it indexes new lines and compacts the journal
+    once enough have piled up. A legacy `posted_jobs.json` is migrated once.
+    """
+
+    def __init__(self, path="posted_jobs.jsonl", legacy_path="posted_jobs.json",
+                 fsync_every=10, fsync_interval=5.0, compact_min_waste=100):
+        """
+        Configure the journal; no file is opened until it is first used.
+
+        Args:
+            path (str): JSONL journal file
+            legacy_path (str): Old JSON history to migrate from, if present
+            fsync_every (int): Appends between fsyncs
+            fsync_interval (float): Maximum seconds an append waits for an fsync
+            compact_min_waste (int): Stale lines needed before compaction, which
+                also waits until they are a tenth of the journal
+        """
+        self.path = path
+        self.legacy_path = legacy_path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_min_waste = compact_min_waste
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def append(self, record):
+        """Append one record, fsyncing once enough appends or time have accumulated."""
+        if self._file is None:
+            self._open_for_append()
+
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+
+        if (self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.sync()
+
+    def sync(self):
+        """Force appended records to disk."""
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """Sync and close the journal; the next append reopens it."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def needs_compaction(self, stale_lines, live_lines):
+        """Whether enough stale lines have piled up to be worth a rewrite."""
+        return stale_lines >= self.compact_min_waste and stale_lines * 10 >= live_lines
+
+    def compact(self):
+        """
+        Atomically rewrite the journal without torn or duplicate lines, keeping
+        the first record for each link.
+
+        The pass holds every distinct link in memory, which is why it only runs
+        once needs_compaction says so.
+
+        Returns:
+            int: Records kept
+        """
+        self.close()
+        seen_links = set()
+        kept = 0
+        tmp_path = f"{self.path}.tmp"
+        with open(self.path, "rb") as src, open(tmp_path, "wb") as dst:
+            for line in src:
+                link = self._line_link(line)
+                if link is None or link in seen_links:
+                    continue
+                seen_links.add(link)
+                dst.write(line)
+                kept += 1
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp_path, self.path)
+        self._sync_directory()
+        return kept
+
+    def _rewrite(self, records):
+        """Atomically replace the journal with exactly `records`."""
+        self.close()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._sync_directory()
+
+    def _open_for_append(self):
+        """Open the journal for appending, terminating a torn last line first."""
+        torn = False
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n"
+        except FileNotFoundError:
+            pass
+
+        self._file = open(self.path, "a", encoding="utf-8")
+        if torn:
+            self._file.write("\n")
+
+    def iter_lines(self, offset=0):
+        """
+        Stream the journal's complete lines without holding the history in memory.
+
+        Args:
+            offset (int): Byte offset to start reading from
+
+        Yields:
+            str or None: The canonical job link of each line, so records written
+                before links were canonicalised still match, or None for a torn
+                or malformed line. A last line still being written is not read.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    yield self._line_link(line)
+        except FileNotFoundError:
+            return
+
+    def iter_links(self, offset=0):
+        """Stream the canonical job link of every valid line; see iter_lines."""
+        return (link for link in self.iter_lines(offset) if link is not None)
+
+    @staticmethod
+    def _line_link(line):
+        """The canonical job link of a complete journal line, or None."""
+        if not line.endswith(b"\n"):
+            return None
+        try:
+            return clean_job_link(json.loads(line)["job_link"])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def find_links(self, links):
+        """
+        Return which of `links` appear in the journal, in one streaming pass.
+
+        The pass stops as soon as every link has been found, but a link that
+        is absent costs a read of the whole journal, so this is only the
+        fallback for when the PostedJobsIndex cannot be opened.
+
+        Args:
+            links (iterable): Job links to look for
+
+        Returns:
+            set: The links that were found
+        """
+        remaining = set(links)
+        found = set()
+        if not remaining:
+            return found
+        for link in self.iter_links():
+            if link in remaining:
+                remaining.discard(link)
+                found.add(link)
+                if not remaining:
+                    break
+        return found
+
+    def identity(self):
+        """Return (inode, size) of the journal file, or (0, 0) if it does not exist."""
+        try:
+            stat = os.stat(self.path)
+            return stat.st_ino, stat.st_size
+        except FileNotFoundError:
+            return 0, 0
+
+    def migrate(self):
+        """Convert the old posted_jobs.json into the journal, once."""
+        if os.path.exists(self.path) or not os.path.exists(self.legacy_path):
+            return
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                records = json.load(f).get("posted_jobs", [])
+            self._rewrite(records)
+            os.replace(self.legacy_path, f"{self.legacy_path}.migrated")
+            print(f"Migrated {len(records)} posted jobs from {self.legacy_path} to {self.path}")
+        except Exception as e:
+            print(f"Error migrating posted jobs from {self.legacy_path}: {e}")
+
+    def _sync_directory(self):
+        """fsync the journal's directory so a rename survives a crash."""
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+class PostedJobsIndex:
+    """
+    SQLite index of the job links in a PostedJobsJournal, keyed by link.
+
+    Confirms the Bloom filter's probable hits with primary-key lookups, so
+    a confirmation costs the same with 1k or 10M posted links and never reads
+    the journal. Like the Bloom filter it records how much of the journal it
+    covers: opening only indexes lines appended since, and the index is rebuilt
+    if the journal file was replaced (migrated or compacted). It also counts
+    the journal's live and stale (torn or duplicate) lines, which is what
+    decides when the journal is compacted.
+    """
+
+    # Links per SELECT, below SQLite's bound-parameter limit
+    QUERY_BATCH = 500
+
+    def __init__(self, journal, path="posted_jobs.index.sqlite3"):
+        """
+        Configure the index; call open() before using it.
+
+        Args:
+            journal (PostedJobsJournal): Journal the index mirrors
+            path (str): SQLite database file
+        """
+        self.journal = journal
+        self.path = path
+        self.live_lines = 0
+        self.stale_lines = 0
+        self._conn = None
+
+    def open(self):
+        """
+        Open the database and bring it up to date with the journal, compacting
+        the journal first if it has gathered enough stale lines.
+        """
+        self.journal.migrate()
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS links (job_link TEXT PRIMARY KEY) WITHOUT ROWID")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._conn.commit()
+
+        self._update()
+        if self.journal.needs_compaction(self.stale_lines, self.live_lines):
+            print(f"Compacting posted jobs journal ({self.stale_lines} stale lines)")
+            self.journal.compact()
+            self._update()
+        return self
+
+    def _update(self):
+        """
+        Index the lines appended since the last run (or the whole journal if it
+        was replaced), counting torn and duplicate lines as stale.
+        """
+        inode, size = self.journal.identity()
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        offset = meta.get("offset", 0)
+        self.live_lines = meta.get("links", 0)
+        self.stale_lines = meta.get("stale", 0)
+        if "links" not in meta and meta:
+            # Indexed before the counts were kept
+            self.live_lines = self._conn.execute("SELECT COUNT(*) FROM links").fetchone()[0]
+
+        rebuild = meta.get("inode") != inode or offset > size
+        if not rebuild and offset == size:
+            return
+
+        lines = 0
+
+        def new_links():
+            nonlocal lines
+            for link in self.journal.iter_lines(offset):
+                lines += 1
+                if link is not None:
+                    yield (link,)
+
+        with self._conn:
+            if rebuild:
+                if meta:
+                    print("Rebuilding posted jobs index")
+                self._conn.execute("DELETE FROM links")
+                offset = 0
+                self.live_lines = self.stale_lines = 0
+            changes = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO links (job_link) VALUES (?)", new_links())
+            inserted = self._conn.total_changes - changes
+            self.live_lines += inserted
+            self.stale_lines += lines - inserted
+            self._write_meta(inode, size)
+
+    def find(self, links):
+        """
+        Return which of `links` are in the index.
+
+        Args:
+            links (iterable): Job links to look up
+
+        Returns:
+            set: The links that have been posted
+        """
+        links = list(links)
+        found = set()
+        for start in range(0, len(links), self.QUERY_BATCH):
+            batch = links[start:start + self.QUERY_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            found.update(link for (link,) in self._conn.execute(
+                f"SELECT job_link FROM links WHERE job_link IN ({placeholders})", batch))
+        return found
+
+    def add(self, link):
+        """Record a link just appended to the journal."""
+        inode, size = self.journal.identity()
+        with self._conn:
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO links (job_link) VALUES (?)", (link,)).rowcount
+            if inserted:
+                self.live_lines += 1
+            else:
+                self.stale_lines += 1
+            self._write_meta(inode, size)
+
+    def close(self):
+        """Close the database."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _write_meta(self, inode, offset):
+        """Persist which journal file the index mirrors, how much of it, and its line counts."""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [("inode", inode), ("offset", offset),
+             ("links", self.live_lines), ("stale", self.stale_lines)])
+
+
+class PostedJobsBloom:
+    """
+    Memory-mapped Bloom filter over the job links in a PostedJobsJournal.
+
+    Opening the filter only reads its header and any journal lines appended since
+    it was last updated, so startup time and RSS stay flat however long the
+    history grows. A negative answer is exact; a positive one is only probable
+    and must be confirmed against the PostedJobsIndex. The filter is rebuilt
+    from the journal if it is missing, corrupt, over capacity or the journal
+    was compacted.
+    """
+
+    # Bumped when the file layout or the hashed form of a link changes, forcing a rebuild
+    MAGIC = b"PJBLOOM3"
+    # magic, bit count, hash count, capacity, item count, journal inode, journal offset
+    HEADER = struct.Struct("<8sQQQQQQ")
+    # A link's bits all fall in one page-sized block, so a lookup reads one
+    # page rather than one per hash; the header fills page 0
+    BLOCK_BYTES = 4096
+    BLOCK_BITS = BLOCK_BYTES * 8
+    DATA_OFFSET = BLOCK_BYTES
+
+    def __init__(self, journal, path="posted_jobs.bloom", capacity=1_000_000,
+                 error_rate=0.001):
+        """
+        Configure the filter; call open() before using it.
+
+        Args:
+            journal (PostedJobsJournal): Journal the filter mirrors
+            path (str): Filter file
+            capacity (int): Links the filter is sized for before it is rebuilt larger
+            error_rate (float): Target false-positive rate at capacity
+        """
+        self.journal = journal
+        self.path = path
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._file = None
+        self._mm = None
+
+    def open(self):
+        """Map the filter and bring it up to date with the journal."""
+        self.journal.migrate()
+        inode, size = self.journal.identity()
+
+        header = self._map_existing()
+        if header is None or header["inode"] != inode or header["offset"] > size:
+            self._rebuild(max(self.capacity, header["capacity"] if header else 0))
+        elif header["offset"] < size:
+            for link in self.journal.iter_links(header["offset"]):
+                self._add(link)
+            self._write_header(offset=size)
+
+        if self._count > self._capacity:
+            self._rebuild(max(self._capacity, self._count) * 2)
+        return self
+
+    def might_contain(self, link):
+        """Return False if the link was definitely never posted."""
+        block, bits = self._block_bits(link)
+        # Read the block rather than touching the mapping: a page fault maps
+        # its neighbours too, so lookups through the mapping would pull most
+        # of a large filter into RSS
+        data = os.pread(self._file.fileno(), self.BLOCK_BYTES,
+                        self.DATA_OFFSET + block * self.BLOCK_BYTES)
+        return all(data[bit // 8] & (1 << (bit % 8)) for bit in bits)
+
+    def add(self, link):
+        """Record a link just appended to the journal."""
+        self._add(link)
+        _, size = self.journal.identity()
+        self._write_header(offset=size)
+        if self._count > self._capacity:
+            self._rebuild(max(self._capacity, self._count) * 2)
+
+    def close(self):
+        """Flush and unmap the filter."""
+        if self._mm is not None:
+            self._mm.flush()
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _add(self, link):
+        """Set a link's bits without touching the header."""
+        block, bits = self._block_bits(link)
+        base = self.DATA_OFFSET + block * self.BLOCK_BYTES
+        for bit in bits:
+            self._mm[base + bit // 8] |= 1 << (bit % 8)
+        self._count += 1
+
+    def _block_bits(self, link):
+        """
+        A link's block and its bit positions within the block: one SHA-256
+        digest picks the block, then double hashing picks the bits.
+        """
+        digest = hashlib.sha256(link.encode("utf-8")).digest()
+        block = int.from_bytes(digest[:8], "little") % (self._num_bits // self.BLOCK_BITS)
+        first = int.from_bytes(digest[8:16], "little")
+        second = int.from_bytes(digest[16:24], "little") | 1
+        return block, [(first + i * second) % self.BLOCK_BITS for i in range(self._num_hashes)]
+
+    def _map_existing(self):
+        """Map an existing filter file, returning its header or None if unusable."""
+        try:
+            self._file = open(self.path, "r+b")
+            self._mm = mmap.mmap(self._file.fileno(), 0)
+            magic, num_bits, num_hashes, capacity, count, inode, offset = \
+                self.HEADER.unpack_from(self._mm, 0)
+            if (magic != self.MAGIC or num_bits % self.BLOCK_BITS
+                    or len(self._mm) != self.DATA_OFFSET + num_bits // 8):
+                raise ValueError("Corrupt posted jobs Bloom filter")
+        except (OSError, ValueError, struct.error):
+            self.close()
+            return None
+
+        self._num_bits, self._num_hashes = num_bits, num_hashes
+        self._capacity, self._count = capacity, count
+        self._inode = inode
+        return {"capacity": capacity, "inode": inode, "offset": offset}
+
+    def _rebuild(self, capacity):
+        """Size a new filter for `capacity` links and fill it from the whole journal."""
+        self.close()
+        print(f"Building posted jobs Bloom filter for {capacity} links")
+        num_bits = math.ceil(-capacity * math.log(self.error_rate) / math.log(2) ** 2)
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        num_bits = max(1, math.ceil(num_bits / self.BLOCK_BITS)) * self.BLOCK_BITS
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.truncate(self.DATA_OFFSET + num_bits // 8)
+        os.replace(tmp_path, self.path)
+
+        self._file = open(self.path, "r+b")
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        self._num_bits, self._num_hashes = num_bits, num_hashes
+        self._capacity, self._count = capacity, 0
+
+        inode, size = self.journal.identity()
+        for link in self.journal.iter_links():
+            self._add(link)
+        self._inode = inode
+        self._write_header(offset=size)
+
+    def _write_header(self, offset):
+        """Persist the filter parameters and how much of the journal it covers."""
+        self.HEADER.pack_into(
+            self._mm, 0, self.MAGIC, self._num_bits, self._num_hashes,
+            self._capacity, self._count, self._inode, offset)
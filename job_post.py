@@ -1,49 +1,57 @@
-import os
-import tweepy
 from dotenv import load_dotenv
-import time
 import json
 from datetime import datetime
-from collections import defaultdict
+from job_card_parser import clean_job_link
+from job_history import PostedJobsJournal, PostedJobsIndex, PostedJobsBloom
+from job_selection import select_diverse_jobs
+from rate_limiter import get_scheduler, RateLimitTimeout
+from tweet_queue import TweetQueue
+from twitter_client import get_client, connection_summary
 
 load_dotenv()
 
 
 class TwitterJobPoster:
+    # Runs in which a queued thread's head tweet may fail before it is dead-lettered
+    MAX_THREAD_ATTEMPTS = 3
+
     def __init__(self):
         """Initialize the Twitter Job Poster"""
+        self.scheduler = get_scheduler()
         self.twitter_client = self._setup_twitter_client()
-        self.posted_jobs_file = "posted_jobs.json"
-        self.posted_jobs = self._load_posted_jobs()
+        self.posted_jobs_journal = PostedJobsJournal()
+        self.posted_jobs_index = self._open_posted_jobs_index()
+        self.posted_jobs_bloom = self._open_posted_jobs_bloom()
+        # Links already checked this run, mapped to whether they were posted
+        self.checked_job_links = {}
+        self.thread_queue = TweetQueue()
 
     def _setup_twitter_client(self):
-        """Initialize Twitter API client"""
+        """Get the shared Twitter API client"""
         try:
-            client = tweepy.Client(
-                bearer_token=os.getenv("TWITTER_BEARER_TOKEN"),
-                consumer_key=os.getenv("TWITTER_API_KEY"),
-                consumer_secret=os.getenv("TWITTER_API_SECRET_KEY"),
-                access_token=os.getenv("TWITTER_ACCESS_TOKEN"),
-                access_token_secret=os.getenv("TWITTER_ACCESS_TOKEN_SECRET"),
-            )
-            return client
+            return get_client()
         except Exception as e:
             print(f"Twitter client setup error: {e}")
             return None
 
-    def _load_posted_jobs(self):
-        """Load previously posted jobs from JSON file"""
+    def _open_posted_jobs_index(self):
+        """Open the SQLite index of posted job links"""
         try:
-            if os.path.exists(self.posted_jobs_file):
-                with open(self.posted_jobs_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            return {"posted_jobs": []}
+            return PostedJobsIndex(self.posted_jobs_journal).open()
         except Exception as e:
-            print(f"Error loading posted jobs: {e}")
-            return {"posted_jobs": []}
+            print(f"Error opening posted jobs index: {e}")
+            return None
+
+    def _open_posted_jobs_bloom(self):
+        """Map the Bloom filter of posted job links"""
+        try:
+            return PostedJobsBloom(self.posted_jobs_journal).open()
+        except Exception as e:
+            print(f"Error opening posted jobs Bloom filter: {e}")
+            return None
 
     def _save_posted_job(self, job, tweet_id):
-        """Save posted job details to JSON file"""
+        """Append posted job details to the journal"""
         try:
             job_record = {
                 "job_link": job["link"],
@@ -52,19 +60,45 @@ class TwitterJobPoster:
                 "tweet_id": tweet_id,
                 "posted_at": datetime.now().isoformat(),
             }
-            self.posted_jobs["posted_jobs"].append(job_record)
-
-            with open(self.posted_jobs_file, "w", encoding="utf-8") as f:
-                json.dump(self.posted_jobs, f, indent=2, ensure_ascii=False)
+            self.posted_jobs_journal.append(job_record)
+            if self.posted_jobs_index:
+                self.posted_jobs_index.add(job_record["job_link"])
+            if self.posted_jobs_bloom:
+                self.posted_jobs_bloom.add(job_record["job_link"])
+            self.checked_job_links[job_record["job_link"]] = True
         except Exception as e:
             print(f"Error saving posted job: {e}")
 
+    def find_posted_links(self, job_links):
+        """
+        Return which of the given job links have already been posted.
+        The Bloom filter rules out new links and the probable hits are
+        confirmed by key in the SQLite index, so neither step reads the
+        history; without the index they fall back to a pass over the journal.
+        """
+        job_links = set(job_links)
+        unchecked = {link for link in job_links if link not in self.checked_job_links}
+        if self.posted_jobs_bloom:
+            probable = {link for link in unchecked if self.posted_jobs_bloom.might_contain(link)}
+        else:
+            probable = unchecked
+
+        try:
+            if self.posted_jobs_index:
+                found = self.posted_jobs_index.find(probable)
+            else:
+                found = self.posted_jobs_journal.find_links(probable)
+        except Exception as e:
+            print(f"Error reading posted jobs: {e}")
+            found = set()
+
+        for link in unchecked:
+            self.checked_job_links[link] = link in found
+        return {link for link in job_links if self.checked_job_links[link]}
+
     def is_job_posted(self, job_link):
         """Check if a job has already been posted"""
-        return any(
-            posted_job["job_link"] == job_link
-            for posted_job in self.posted_jobs["posted_jobs"]
-        )
+        return job_link in self.find_posted_links([job_link])
 
     def _format_job_tweet(self, job, job_number):
         """Format job details into a tweet"""
@@ -82,96 +116,152 @@ class TwitterJobPoster:
             print(f"Error formatting tweet: {e}")
             return None
 
-    def post_jobs_to_twitter(self, jobs, max_jobs=5):
+    def post_jobs_to_twitter(self, jobs, max_jobs=5, per_company_cap=2, priority=None):
         """
         Post jobs to Twitter in a thread with jobs from different companies
+        :param per_company_cap: Maximum number of jobs per company in the thread
+        :param priority: Optional sort key for jobs (lower first); scrape order otherwise
         Returns the number of successfully posted jobs
         """
         if not self.twitter_client:
             print("Twitter client not initialized")
             return 0
 
-        # Filter out already posted jobs
-        new_jobs = [job for job in jobs if not self.is_job_posted(job["link"])]
-
-        if not new_jobs:
-            print("No new jobs to post - all jobs have been posted already")
-            return 0
+        try:
+            # Finish any thread a previous run left half-posted before starting a new one
+            jobs_posted = self.resume_pending_threads()
 
-        # Group jobs by company
-        company_jobs = defaultdict(list)
-        for job in new_jobs:
-            company_jobs[job['company']].append(job)
-
-        # Flatten the grouped jobs, ensuring we pick from different companies
-        filtered_jobs = []
-        companies_used = set()
-        for company, company_job_list in company_jobs.items():
-            if len(filtered_jobs) >= max_jobs:
-                break
-            
-            # Add one job from this company if we haven't used it yet
-            if company not in companies_used:
-                filtered_jobs.append(company_job_list[0])
-                companies_used.add(company)
-
-        # If we don't have enough jobs, add more from different companies
-        for company, company_job_list in company_jobs.items():
-            if len(filtered_jobs) >= max_jobs:
-                break
-            
-            # If we have more than one job from this company and we need more jobs
-            if len(company_job_list) > 1 and company in companies_used:
-                filtered_jobs.append(company_job_list[1])
-
-        if not filtered_jobs:
-            print("No new jobs to post - unable to find diverse jobs")
-            return 0
+            # Filter out already posted (or still queued) jobs and pick across
+            # companies. The filter is lazy, so only the jobs the selector
+            # actually reads are looked up, however many were scraped
+            queued_links = self.thread_queue.pending_job_links()
+            new_jobs = (
+                job for job in jobs
+                if job["link"] not in queued_links and not self.is_job_posted(job["link"])
+            )
+            filtered_jobs = list(select_diverse_jobs(
+                new_jobs, max_jobs, per_company_cap=per_company_cap, key=priority))
 
-        print(f"Found {len(filtered_jobs)} new jobs to post from different companies")
+            if not filtered_jobs:
+                print("No new jobs to post - all jobs have been posted already")
+                return jobs_posted
 
-        try:
-            # Create the main tweet
-            main_tweet_text = f"🚨 New Job Postings! 🌐\n\nThread Below 👇"
-            main_response = self.twitter_client.create_tweet(text=main_tweet_text)
-            main_tweet_id = main_response.data["id"]
-            
-            # Post jobs as replies
-            parent_tweet_id = main_tweet_id
-            jobs_posted = 0
+            print(f"Found {len(filtered_jobs)} new jobs to post from different companies")
 
+            tweets = [{"text": f"🚨 New Job Postings! 🌐\n\nThread Below 👇"}]
             for i, job in enumerate(filtered_jobs, 1):
                 tweet_text = self._format_job_tweet(job, i)
-                
                 if tweet_text:
-                    try:
-                        # Post each job as a reply to the previous tweet
-                        reply_response = self.twitter_client.create_tweet(
-                            text=tweet_text, 
-                            in_reply_to_tweet_id=parent_tweet_id
-                        )
-                        
-                        # Save the job as posted
-                        self._save_posted_job(job, reply_response.data["id"])
-                        
-                        # Update parent tweet ID for next iteration
-                        parent_tweet_id = reply_response.data["id"]
-                        
-                        jobs_posted += 1
-                        print(f"Successfully posted job: {job['title']} from {job['company']}")
-                        
-                        # Wait between tweets to avoid rate limits
-                        time.sleep(30)
-                        
-                    except Exception as e:
-                        print(f"Failed to post job: {e}")
-                        continue
-
-            return jobs_posted
+                    tweets.append({"text": tweet_text, "job": job})
 
-        except Exception as e:
-            print(f"Error creating tweet thread: {e}")
-            return 0
+            thread = self.thread_queue.enqueue(tweets)
+            return jobs_posted + self._post_thread(thread)
+
+        finally:
+            self.posted_jobs_journal.close()
+
+    def resume_pending_threads(self):
+        """
+        Post the remaining tweets of every queued thread
+        Returns the number of jobs posted
+        """
+        jobs_posted = 0
+        for thread in self.thread_queue.pending():
+            print(f"Resuming queued thread {thread['id']}")
+            jobs_posted += self._post_thread(thread)
+        return jobs_posted
+
+    def _post_thread(self, thread):
+        """
+        Post a queued thread from its first unposted tweet, saving progress after
+        every tweet so a crash resumes at the right reply
+        Returns the number of jobs posted
+        """
+        jobs_posted = 0
+        for tweet in thread["tweets"]:
+            if tweet["tweet_id"] or tweet["failed"]:
+                continue
+
+            job = tweet.get("job")
+            if job and self.is_job_posted(job["link"]):
+                tweet["failed"] = True
+                self.thread_queue.save(thread)
+                continue
+
+            try:
+                # Each tweet replies to the previous one; the scheduler paces
+                # posts by the remaining rate-limit quota
+                response = self.scheduler.call(
+                    self.twitter_client.create_tweet,
+                    text=tweet["text"],
+                    in_reply_to_tweet_id=thread["parent_tweet_id"]
+                )
+            except RateLimitTimeout as e:
+                # Not the thread's fault: leave it queued for a later run
+                print(f"Rate limit reached, leaving thread {thread['id']} queued: {e}")
+                return jobs_posted
+            except Exception as e:
+                if not thread["parent_tweet_id"]:
+                    # Without a head tweet nothing can be posted; retry on a later
+                    # run, but stop a permanently rejected thread from blocking
+                    # the queue and keeping its jobs out of every selection
+                    thread["attempts"] = thread.get("attempts", 0) + 1
+                    if thread["attempts"] >= self.MAX_THREAD_ATTEMPTS:
+                        print(f"Giving up on thread {thread['id']} after "
+                              f"{thread['attempts']} attempts: {e}")
+                        self.thread_queue.dead_letter(thread)
+                    else:
+                        print(f"Error creating tweet thread: {e}")
+                        self.thread_queue.save(thread)
+                    return jobs_posted
+                print(f"Failed to post job: {e}")
+                tweet["failed"] = True
+                self.thread_queue.save(thread)
+                continue
+
+            tweet_id = response.data["id"]
+            if job:
+                # Journal the job before recording progress in the queue, so a
+                # crash in between is caught by is_job_posted on resume instead
+                # of leaving a posted job that a later scrape would repost
+                self._save_posted_job(job, tweet_id)
+                jobs_posted += 1
+                print(f"Successfully posted job: {job['title']} from {job['company']}")
+
+            tweet["tweet_id"] = tweet_id
+            thread["parent_tweet_id"] = tweet_id
+            self.thread_queue.save(thread)
+
+        self.thread_queue.complete(thread)
+        return jobs_posted
+
+    def close(self):
+        """Flush the posted jobs history"""
+        self.posted_jobs_journal.close()
+        if self.posted_jobs_index:
+            self.posted_jobs_index.close()
+            self.posted_jobs_index = None
+        if self.posted_jobs_bloom:
+            self.posted_jobs_bloom.close()
+            self.posted_jobs_bloom = None
+
+
+def load_jobs(json_file="linkedin_jobs.json"):
+    """
+    Load valid jobs (with title, link and company) from the scraped JSON file,
+    with canonical links so files from older scrapes dedupe correctly
+    :param json_file: Path to the JSON file containing jobs
+    """
+    with open(json_file, "r", encoding="utf-8") as f:
+        jobs = json.load(f).get("jobs", [])
+
+    valid_jobs = [
+        job for job in jobs 
+        if job.get("title") and job.get("link") and job.get("company")
+    ]
+    for job in valid_jobs:
+        job["link"] = clean_job_link(job["link"])
+    return valid_jobs
 
 
 def post_linkedin_jobs_to_twitter(json_file="linkedin_jobs.json", max_jobs=5):
@@ -181,13 +271,11 @@ def post_linkedin_jobs_to_twitter(json_file="linkedin_jobs.json", max_jobs=5):
     :param max_jobs: Maximum number of jobs to post in a single thread
     """
     try:
-        # Load jobs from JSON file
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            jobs = data.get("jobs", [])
+        # Load valid jobs (must have title, link, and company) from JSON file
+        valid_jobs = load_jobs(json_file)
 
-        if not jobs:
-            print("No jobs found in JSON file")
+        if not valid_jobs:
+            print("No valid jobs to post")
             return
 
         # Initialize Twitter poster
@@ -196,20 +284,14 @@ def post_linkedin_jobs_to_twitter(json_file="linkedin_jobs.json", max_jobs=5):
             print("Failed to initialize Twitter client. Check your credentials.")
             return
 
-        # Filter valid jobs (must have title, link, and company)
-        valid_jobs = [
-            job for job in jobs 
-            if job.get("title") and job.get("link") and job.get("company")
-        ]
-        
-        if not valid_jobs:
-            print("No valid jobs to post")
-            return
-
         # Post jobs
         print(f"Attempting to post up to {max_jobs} new jobs to Twitter...")
-        jobs_posted = job_poster.post_jobs_to_twitter(valid_jobs, max_jobs)
+        try:
+            jobs_posted = job_poster.post_jobs_to_twitter(valid_jobs, max_jobs)
+        finally:
+            job_poster.close()
         print(f"Successfully posted {jobs_posted} new jobs to Twitter")
+        print(connection_summary())
 
     except FileNotFoundError:
         print(f"JSON file not found: {json_file}")
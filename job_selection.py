@@ -0,0 +1,69 @@
+from bisect import insort
+
+
+def select_diverse_jobs(jobs, max_jobs, per_company_cap=2, key=None):
+    """
+    Yield up to `max_jobs` jobs, round-robin across companies.
+
+    The first round takes one job per company, the next round a second job per
+    company, and so on up to `per_company_cap` jobs each. Jobs are read lazily
+    from `jobs` (any iterable, e.g. a generator of unposted jobs): in scrape
+    order the first round is yielded while streaming, so reading stops as soon
+    as `max_jobs` is reached, and only `per_company_cap - 1` spare jobs per
+    company are ever held. Cost is O(jobs read + companies * per_company_cap).
+
+    :param jobs: Iterable of job dicts with a 'company' key
+    :param max_jobs: Maximum number of jobs to yield
+    :param per_company_cap: Maximum number of jobs to yield per company
+    :param key: Optional priority key (lower sorts first, like sorted()). When
+        set, the whole stream is read to keep each company's best jobs, and
+        companies are visited in order of their best job.
+    """
+    if max_jobs <= 0 or per_company_cap <= 0:
+        return
+
+    if key is not None:
+        yield from _select_by_priority(jobs, max_jobs, per_company_cap, key)
+        return
+
+    spares = {}
+    selected = 0
+    for job in jobs:
+        company = job['company']
+        if company not in spares:
+            spares[company] = []
+            yield job
+            selected += 1
+            if selected >= max_jobs:
+                return
+        elif len(spares[company]) < per_company_cap - 1:
+            spares[company].append(job)
+
+    for round_index in range(per_company_cap - 1):
+        for company_jobs in spares.values():
+            if round_index < len(company_jobs):
+                yield company_jobs[round_index]
+                selected += 1
+                if selected >= max_jobs:
+                    return
+
+
+def _select_by_priority(jobs, max_jobs, per_company_cap, key):
+    """Round-robin over each company's `per_company_cap` best jobs by `key`."""
+    best = {}
+    for position, job in enumerate(jobs):
+        company_jobs = best.setdefault(job['company'], [])
+        # Position breaks ties so jobs themselves are never compared
+        insort(company_jobs, (key(job), position, job))
+        if len(company_jobs) > per_company_cap:
+            company_jobs.pop()
+
+    companies = sorted(best.values(), key=lambda company_jobs: company_jobs[0][:2])
+    selected = 0
+    for round_index in range(per_company_cap):
+        for company_jobs in companies:
+            if round_index < len(company_jobs):
+                yield company_jobs[round_index][2]
+                selected += 1
+                if selected >= max_jobs:
+                    return
@@ -0,0 +1,96 @@
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from rate_limiter import HostThrottle
+from job_card_parser import parse_job_cards
+
+GUEST_SEARCH_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+GEO_ID = "102713980"
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
+)
+
+
+class GuestJobFetcher:
+    """
+    Fetch company job listings from LinkedIn's guest endpoint over plain HTTP.
+
+    Needs no browser or login: result pages are requested over a pooled
+    keep-alive session and parsed with JobCardParser. Records match the
+    {title, link, company} shape save_to_json writes for the Selenium scraper.
+    """
+
+    def __init__(self, max_pages=4, timeout=15, min_interval=2.0, pool_size=10):
+        """
+        Args:
+            max_pages (int): Result pages to fetch per company
+            timeout (float): Per-request timeout in seconds
+            min_interval (float): Minimum seconds between requests to one host
+            pool_size (int): Keep-alive connections kept open
+        """
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.throttle = HostThrottle(min_interval)
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+
+    def fetch_company_jobs(self, company_name, company_id):
+        """
+        Fetch every result page for one company.
+
+        Raises:
+            requests.RequestException: If a page cannot be fetched
+        """
+        jobs = []
+        start = 0
+        for _ in range(self.max_pages):
+            params = {"f_C": company_id, "geoId": GEO_ID, "start": start}
+            self.throttle.wait(GUEST_SEARCH_URL)
+            response = self.session.get(GUEST_SEARCH_URL, params=params, timeout=self.timeout)
+            response.raise_for_status()
+
+            cards = parse_job_cards(response.text)
+            if not cards:
+                break
+            jobs.extend(
+                {'title': card['title'], 'link': card['link'], 'company': company_name.capitalize()}
+                for card in cards
+            )
+            start += len(cards)
+
+        print(f"Fetched {len(jobs)} jobs for {company_name} over HTTP")
+        return jobs
+
+    def fetch_companies(self, companies, company_ids, workers=3):
+        """
+        Fetch several companies concurrently.
+
+        Returns:
+            tuple: (jobs keyed by company, companies that failed and need the
+                Selenium fallback)
+        """
+        def fetch(company):
+            company_id = company_ids.get(company.lower())
+            if not company_id:
+                print(f"No company ID found for {company}")
+                return company, []
+            try:
+                return company, self.fetch_company_jobs(company, company_id)
+            except requests.RequestException as e:
+                print(f"HTTP fetch failed for {company}: {e}")
+                return company, None
+
+        jobs_by_company = {}
+        failed = []
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for company, jobs in executor.map(fetch, companies):
+                if jobs is None:
+                    failed.append(company)
+                else:
+                    jobs_by_company[company] = jobs
+        return jobs_by_company, failed
+
+    def close(self):
+        self.session.close()
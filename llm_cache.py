@@ -0,0 +1,177 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+
+class LLMCache:
+    """
+    A content-addressed cache of Groq chat completions, stored in SQLite.
+
+    Entries are keyed by a hash of the model, prompt, temperature and any other
+    request parameters, expire after a TTL and are evicted least-recently-used
+    once the stored responses grow past a size budget. The database runs in WAL
+    mode so overlapping cron runs can share it.
+    """
+
+    def __init__(self, path="cache/llm_cache.sqlite3", ttl=7 * 24 * 60 * 60,
+                 max_bytes=50 * 1024 * 1024):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str): SQLite database file
+            ttl (int): Seconds before a cached response expires
+            max_bytes (int): Size budget for stored response text
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " content TEXT NOT NULL,"
+            " tokens INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model, prompt, temperature, **params):
+        """Hash the request into a stable cache key."""
+        payload = json.dumps([model, prompt, temperature, params], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def complete(self, client, prompt, model, temperature, max_tokens, fresh=False,
+                 validate=None, **params):
+        """
+        Return the response text for a single-message chat completion.
+
+        Args:
+            client: Groq client used on a cache miss
+            prompt (str): User message content
+            model (str): Groq model name
+            temperature (float): Sampling temperature
+            max_tokens (int): Completion token budget
+            fresh (bool): Skip the cache lookup (the new response is still stored);
+                such calls are not counted as lookups in the hit rate
+            validate (callable): Called with the content; raises ValueError if the
+                response is unusable. Unusable responses are never stored, and a
+                cached one that fails is treated as a miss.
+            **params: Extra request parameters, e.g. response_format
+
+        Returns:
+            str: The completion's message content
+
+        Raises:
+            ValueError: If `validate` rejects the new response
+        """
+        key = self.make_key(model, prompt, temperature, max_tokens=max_tokens, **params)
+
+        if not fresh:
+            cached = self._get(key, validate)
+            if cached is not None:
+                return cached
+            with self._lock:
+                self.misses += 1
+
+        response = client.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **params,
+        )
+        content = response.choices[0].message.content
+        if validate:
+            validate(content)
+        if isinstance(content, str):
+            usage = getattr(response, "usage", None)
+            self._put(key, content, getattr(usage, "total_tokens", 0) or 0)
+        return content
+
+    def summary(self):
+        """Describe hit rate and saved tokens for the run summary."""
+        lookups = self.hits + self.misses
+        hit_rate = (self.hits / lookups * 100) if lookups else 0.0
+        return (
+            f"LLM cache: {self.hits}/{lookups} hits ({hit_rate:.0f}%), "
+            f"{self.saved_tokens} tokens saved"
+        )
+
+    def _get(self, key, validate=None):
+        """
+        Look up a live entry that passes `validate`, recording the hit and
+        refreshing its LRU position.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, tokens FROM responses WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl),
+            ).fetchone()
+            if row is None:
+                return None
+            if validate:
+                try:
+                    validate(row[0])
+                except ValueError:
+                    return None
+
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            self.saved_tokens += row[1]
+            return row[0]
+
+    def _put(self, key, content, tokens):
+        """Store a response, then drop expired entries and enforce the size budget."""
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, content, tokens, len(content.encode("utf-8")), now, now),
+                )
+                self._conn.execute(
+                    "DELETE FROM responses WHERE created_at <= ?", (now - self.ttl,))
+
+                total = self._conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+                if total > self.max_bytes:
+                    rows = self._conn.execute(
+                        "SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+                    for old_key, size in rows:
+                        if total <= self.max_bytes:
+                            break
+                        self._conn.execute("DELETE FROM responses WHERE key = ?", (old_key,))
+                        total -= size
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error writing LLM cache: {e}")
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Return the process-wide LLM cache shared by every generator."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache()
+        return _default_cache
@@ -1,14 +1,26 @@
 import os
+import time
 import tweepy
+from PIL import Image
+from image_encoding import encode_for_upload
 from dotenv import load_dotenv
+from rate_limiter import get_scheduler
+from twitter_client import get_client, get_media_api
 
 load_dotenv()
 
 
 class TwitterPoster:
+    # Twitter accepts up to 5MB per APPEND; smaller segments make retries cheaper
+    UPLOAD_SEGMENT_BYTES = 1024 * 1024
+    UPLOAD_RETRIES = 3
+    # Twitter keeps an uploaded image for 24 hours unless INIT reports otherwise
+    DEFAULT_MEDIA_TTL = 24 * 60 * 60
+
     def __init__(self):
         try:
             print("Initializing TwitterPoster...")
+            self.scheduler = get_scheduler()
             self._initialize_twitter()
             print("Initialization complete.")
         except Exception as e:
@@ -17,61 +29,34 @@ class TwitterPoster:
     def _initialize_twitter(self):
         try:
             print("Loading Twitter API credentials...")
-            self.api_key = os.getenv('TWITTER_API_KEY')
-            self.api_secret_key = os.getenv('TWITTER_API_SECRET_KEY')
-            self.access_token = os.getenv('TWITTER_ACCESS_TOKEN')
-            self.access_token_secret = os.getenv('TWITTER_ACCESS_TOKEN_SECRET')
-            self.bearer_token = os.getenv('TWITTER_BEARER_TOKEN')
-
-            if not all([self.api_key, self.api_secret_key, self.access_token,
-                        self.access_token_secret, self.bearer_token]):
-                raise ValueError(
-                    "Missing required Twitter API credentials in .env file")
-
-            self.client = tweepy.Client(
-                bearer_token=self.bearer_token,
-                consumer_key=self.api_key,
-                consumer_secret=self.api_secret_key,
-                access_token=self.access_token,
-                access_token_secret=self.access_token_secret
-            )
+            self.client = get_client()
             print("Twitter Client initialized successfully.")
-
-            print("Initializing Twitter API v1.1 for media uploads...")
-            auth = tweepy.OAuth1UserHandler(
-                self.api_key,
-                self.api_secret_key,
-                self.access_token,
-                self.access_token_secret
-            )
-            self.api = tweepy.API(auth)
-            print("Twitter API v1.1 initialized successfully for media uploads.")
-
         except Exception as e:
             print(f"Error initializing Twitter API: {str(e)}")
 
-    def post_tweet(self, image_path, tweet_text):
-        try:
-            print(
-                f"Preparing to post tweet with image at {image_path} and text: '{tweet_text}'")
+    @property
+    def api(self):
+        """Twitter API v1.1 for media uploads, only authenticated on first upload."""
+        return get_media_api()
 
-            if not os.path.exists(image_path):
-                raise FileNotFoundError(f"Image file not found: {image_path}")
+    def post_tweet(self, image, tweet_text):
+        """
+        Post a tweet with one image.
 
-            print("Uploading media...")
-            media = self.api.media_upload(image_path)
-            print(
-                f"Media uploaded successfully. Media ID: {media.media_id_string}")
+        Args:
+            image: Path to an image file, or a rendered meme dict ('data' and
+                'mime_type') from MemeGenerator, uploaded as-is without touching disk
+            tweet_text (str): Tweet text
 
-            print("Posting tweet with media...")
-            response = self.client.create_tweet(
-                text=tweet_text,
-                media_ids=[media.media_id_string]
-            )
+        Returns:
+            bool: True if the tweet was posted
+        """
+        try:
+            media_id, _ = self.preupload(image)
+            print(f"Media uploaded successfully. Media ID: {media_id}")
 
-            tweet_id = response.data.get('id')
+            tweet_id = self.post_with_media_id(tweet_text, media_id)
             if tweet_id:
-                print(f"Tweet posted successfully! Tweet ID: {tweet_id}")
                 return True
             else:
                 print("Error: Tweet ID not returned in the response.")
@@ -87,6 +72,112 @@ class TwitterPoster:
             print(f"Unexpected error posting to Twitter: {str(e)}")
             return False
 
+    def post_with_media_id(self, tweet_text, media_id):
+        """
+        Post a tweet with an image uploaded ahead of time by preupload, as a
+        single create_tweet call.
+
+        Returns:
+            str: The new tweet's ID, or None if the response had none
+
+        Raises:
+            tweepy.errors.TweepyException: If the post fails; see
+                is_invalid_media_error to tell a rejected media ID apart
+        """
+        print(f"Posting tweet with media {media_id} and text: '{tweet_text}'")
+        response = self.scheduler.call(
+            self.client.create_tweet,
+            text=tweet_text,
+            media_ids=[media_id]
+        )
+        tweet_id = response.data.get('id')
+        if tweet_id:
+            print(f"Tweet posted successfully! Tweet ID: {tweet_id}")
+        return tweet_id
+
+    def preupload(self, image):
+        """
+        Upload an image ahead of the tweet that will use it.
+
+        Args:
+            image: Path to an image file or a rendered meme dict
+
+        Returns:
+            tuple: (media_id, expires_at), where expires_at is the Unix time
+                after which Twitter no longer accepts the media ID
+        """
+        if isinstance(image, dict):
+            print("Uploading in-memory media...")
+            data, mime_type = image['data'], image['mime_type']
+        else:
+            print(f"Uploading media from {image}...")
+            data, mime_type = self._encode_file(image)
+        return self._upload(data, mime_type)
+
+    def _encode_file(self, image_path):
+        """Read an image file and encode it for upload."""
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"Image file not found: {image_path}")
+
+        with Image.open(image_path) as img:
+            data, mime_type = encode_for_upload(img)
+        if not data:
+            raise ValueError(f"Could not encode {image_path} within Twitter's size limit")
+        return data, mime_type
+
+    def upload_media(self, data, mime_type):
+        """
+        Upload encoded image bytes with chunked INIT/APPEND/FINALIZE.
+
+        A failed APPEND or FINALIZE is retried against the same media ID, so an
+        upload resumes from the failed segment instead of starting over.
+
+        Returns:
+            str: The uploaded media ID
+        """
+        media_id, _ = self._upload(data, mime_type)
+        return media_id
+
+    def _upload(self, data, mime_type):
+        """Chunked upload returning (media_id, expires_at)."""
+        started = time.monotonic()
+        media = self._with_retries(
+            "INIT", self.api.chunked_upload_init, len(data), mime_type,
+            media_category="tweet_image")
+        media_id = media.media_id_string
+        expires_at = time.time() + getattr(media, "expires_after_secs", self.DEFAULT_MEDIA_TTL)
+
+        for segment_index, offset in enumerate(range(0, len(data), self.UPLOAD_SEGMENT_BYTES)):
+            segment = data[offset:offset + self.UPLOAD_SEGMENT_BYTES]
+            self._with_retries(
+                f"APPEND segment {segment_index}", self.api.chunked_upload_append,
+                media_id, segment, segment_index)
+
+        self._with_retries("FINALIZE", self.api.chunked_upload_finalize, media_id)
+        print(
+            f"Uploaded {len(data) / 1024:.0f} KB as {mime_type} "
+            f"in {time.monotonic() - started:.2f}s")
+        return media_id, expires_at
+
+    def _with_retries(self, step, func, *args, **kwargs):
+        """Run one upload step, retrying transient failures with a short backoff."""
+        for attempt in range(self.UPLOAD_RETRIES):
+            try:
+                return func(*args, **kwargs)
+            except (tweepy.errors.TweepyException, OSError) as e:
+                if attempt == self.UPLOAD_RETRIES - 1:
+                    raise
+                print(f"Media upload {step} failed ({e}), retrying...")
+                time.sleep(2 ** attempt)
+
+
+def is_invalid_media_error(error):
+    """
+    Return True if Twitter rejected a post because its media ID is invalid or
+    expired, as opposed to a transient, rate-limit or account-level failure.
+    """
+    return isinstance(error, tweepy.errors.BadRequest) and "media" in str(error).lower()
+
 
 if __name__ == "__main__":
     poster = TwitterPoster()
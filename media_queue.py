@@ -0,0 +1,135 @@
+import os
+import json
+import time
+
+
+class MediaQueue:
+    """
+    Durable queue of memes whose images are already uploaded to Twitter.
+
+    Each entry keeps the uploaded `media_id`, the tweet text to post with it and
+    the time Twitter expires the upload. Posting from the queue is then a single
+    `create_tweet` call. Entries that expire (or are about to) are re-uploaded
+    from their archived image when they have one and a `refresh` callback is
+    set, and evicted otherwise, so a stale media ID is never posted.
+    """
+
+    def __init__(self, path="media_queue.json", expiry_margin=600, refresh=None,
+                 clock=time.time):
+        """
+        Initialize the queue, creating its directory.
+
+        Args:
+            path (str): JSON file holding the queued uploads
+            expiry_margin (int): Seconds before expiry at which an upload is
+                treated as expired
+            refresh (callable): Re-uploads an image file, returning
+                (media_id, expires_at); used for expired entries with a 'path'
+            clock (callable): Source of the current time
+        """
+        self.path = path
+        self.expiry_margin = expiry_margin
+        self.refresh = refresh
+        self.clock = clock
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def __len__(self):
+        return len(self._load_valid())
+
+    def add(self, media_id, expires_at, text, topic=None, path=None):
+        """
+        Queue an uploaded image and the text to post it with.
+
+        Args:
+            path (str): Archived copy of the image, so an expired upload can be
+                refreshed instead of dropped
+        """
+        entries = self._load_valid()
+        entries.append({
+            "media_id": media_id,
+            "expires_at": expires_at,
+            "text": text,
+            "topic": topic,
+            "path": path,
+        })
+        self._save(entries)
+
+    def peek(self):
+        """
+        Return the oldest usable entry without removing it, refreshing it first
+        if it has expired. Call remove() once the entry has been dealt with.
+
+        Returns:
+            dict: The entry, or None if the queue is empty
+        """
+        entries = self._load_valid(refresh=True)
+        return entries[0] if entries else None
+
+    def remove(self, entry):
+        """Remove an entry after it was posted or rejected."""
+        entries = self._load()
+        remaining = [queued for queued in entries if queued["media_id"] != entry["media_id"]]
+        if len(remaining) != len(entries):
+            self._save(remaining)
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable media queue {self.path}: {e}")
+            return []
+
+    def _load_valid(self, refresh=False):
+        """
+        Load the queue, refreshing (if asked) or dropping expired entries and
+        persisting the result.
+        """
+        entries = self._load()
+        deadline = self.clock() + self.expiry_margin
+        valid = []
+        evicted = 0
+        changed = False
+        for entry in entries:
+            if entry["expires_at"] > deadline:
+                valid.append(entry)
+            elif refresh and self._refresh(entry):
+                valid.append(entry)
+                changed = True
+            elif refresh or not self._can_refresh(entry):
+                evicted += 1
+            else:
+                # Kept for peek() to refresh
+                valid.append(entry)
+
+        if evicted:
+            print(f"Evicted {evicted} expired media uploads")
+        if evicted or changed:
+            self._save(valid)
+        return valid
+
+    def _can_refresh(self, entry):
+        return bool(self.refresh and entry.get("path") and os.path.exists(entry["path"]))
+
+    def _refresh(self, entry):
+        """Re-upload an expired entry's archived image in place; True on success."""
+        if not self._can_refresh(entry):
+            return False
+        try:
+            entry["media_id"], entry["expires_at"] = self.refresh(entry["path"])
+        except Exception as e:
+            print(f"Error refreshing expired upload of {entry['path']}: {e}")
+            return False
+        print(f"Refreshed expired upload of {entry['path']}")
+        return True
+
+    def _save(self, entries):
+        """Atomically persist the queue."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
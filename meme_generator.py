@@ -1,11 +1,247 @@
 import os
+import json
+import threading
+import multiprocessing
 import requests
 from PIL import Image, ImageDraw, ImageFont
-import random
 from io import BytesIO
 from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from groq import Groq
 from dotenv import load_dotenv
+from template_store import TemplateStore, TemplateIndex
+from image_encoding import encode_for_upload
+from llm_cache import get_llm_cache
+
+
+
+@lru_cache(maxsize=128)
+def load_font(font_path, font_size):
+    """
+    Load a FreeType font once per (path, size) for the whole process.
+    
+    `load_font.cache_info()` reports how many fonts were actually parsed (misses)
+    versus reused (hits).
+    """
+    return ImageFont.truetype(font_path, font_size)
+
+
+def render_process_pool(max_workers=None):
+    """
+    Process pool for MemeRenderer.render.
+
+    Workers start lazily, on the first submit, while template and LLM threads
+    are already running; forking a multi-threaded process can copy held locks
+    into the child, so workers come from a forkserver (or are spawned) instead.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(method))
+
+
+class MemeRenderer:
+    """
+    Pillow-only meme rendering: resizing, caption layout, drawing and encoding.
+    
+    The renderer holds no API clients, so it can be pickled and run inside
+    worker processes by MemeGenerator.create_memes.
+    """
+
+    # File extension for each upload encoding, used when archiving to disk
+    EXTENSIONS = {"image/png": ".png", "image/webp": ".webp", "image/jpeg": ".jpg"}
+
+    def __init__(self, font_path, single_pass_outline=True):
+        """
+        Initialize the renderer with its font and outline mode.
+        
+        Args:
+            font_path (str): Path to the TrueType font used for captions
+            single_pass_outline (bool): Rasterise each caption line once with a
+                stroked outline instead of the legacy five-pass outline
+        """
+        self.font_path = font_path
+        self.single_pass_outline = single_pass_outline
+
+    def render(self, image_bytes, top_text, bottom_text, archive_path=None):
+        """
+        Render captions onto a template image and encode it once, in memory.
+        
+        Args:
+            image_bytes (bytes): Encoded template image
+            top_text (str): Caption for the top of the meme
+            bottom_text (str): Caption for the bottom of the meme
+            archive_path (str): Optional path (without extension) to also write
+                the encoded meme to
+            
+        Returns:
+            dict: 'data' (encoded bytes ready for upload), 'mime_type' and
+                'path' (None unless archived)
+        """
+        img = Image.open(BytesIO(image_bytes))
+        
+        # Ensure minimum image size
+        min_size = 800
+        if img.width < min_size or img.height < min_size:
+            ratio = max(min_size / img.width, min_size / img.height)
+            new_size = (int(img.width * ratio), int(img.height * ratio))
+            img = img.resize(new_size, Image.Resampling.LANCZOS)
+
+        draw = ImageDraw.Draw(img)
+        
+        # Calculate text parameters
+        longest_text = max(top_text, bottom_text, key=len)
+        font_size = self._calculate_font_size(img, longest_text)
+        font = load_font(self.font_path, font_size)
+        
+        # Calculate layout parameters with adjusted margins
+        margin = int(img.height * 0.06)  # Increased from 0.05 for better spacing
+        max_text_width = img.width - (2 * margin)
+        line_height = int(font_size * 1.3)  # Reduced from 1.4 for tighter spacing
+        stroke_width = max(2, int(font_size * 0.04))  # Reduced from 0.05
+
+        # Draw top text
+        y_position = margin
+        for line in self._wrap_text(top_text, font, max_text_width):
+            x_position = (img.width - font.getlength(line)) // 2
+            self._draw_text_with_outline(draw, line, x_position, y_position, font, stroke_width)
+            y_position += line_height
+
+        # Draw bottom text
+        bottom_lines = self._wrap_text(bottom_text, font, max_text_width)
+        y_position = img.height - margin - (len(bottom_lines) * line_height)
+        for line in bottom_lines:
+            x_position = (img.width - font.getlength(line)) // 2
+            self._draw_text_with_outline(draw, line, x_position, y_position, font, stroke_width)
+            y_position += line_height
+
+        data, mime_type = encode_for_upload(img)
+        if not data:
+            raise ValueError("Rendered meme does not fit Twitter's image size limit")
+
+        path = None
+        if archive_path:
+            path = archive_path + self.EXTENSIONS[mime_type]
+            with open(path, "wb") as f:
+                f.write(data)
+        return {'data': data, 'mime_type': mime_type, 'path': path}
+
+    def _calculate_font_size(self, img, text, max_width_ratio=0.80):
+        """
+        Calculate the optimal font size for the given text and image dimensions.
+        Sizes are now smaller compared to the original version.
+        
+        Args:
+            img: PIL Image object
+            text (str): Text to be rendered
+            max_width_ratio (float): Maximum width ratio for text
+            
+        Returns:
+            int: Optimal font size
+        """
+        # Reduced size percentages for smaller text
+        initial_size = int(img.height * 0.12)  # Reduced from 0.15
+        min_size = int(img.height * 0.06)      # Reduced from 0.08
+        max_size = int(img.height * 0.15)      # Reduced from 0.20
+        
+        font_size = min(initial_size, max_size)
+        max_width = img.width * max_width_ratio
+        
+        # Candidate sizes step down by 2px while above min_size; rendered width
+        # shrinks with size, so binary search for the first candidate that fits.
+        # If none fits, fall through to the first size at or below min_size.
+        low, high = 0, max(0, (font_size - min_size + 1) // 2)
+        while low < high:
+            mid = (low + high) // 2
+            font = load_font(self.font_path, font_size - 2 * mid)
+            if font.getlength(text) <= max_width:
+                high = mid
+            else:
+                low = mid + 1
+            
+        return font_size - 2 * low
+
+    def _wrap_text(self, text, font, max_width):
+        """
+        Wrap text to fit within the specified width.
+        
+        Args:
+            text (str): Text to wrap
+            font: PIL ImageFont object
+            max_width (int): Maximum width in pixels
+            
+        Returns:
+            list: Lines of wrapped text
+        """
+        words = text.split()
+        lines = []
+        current_line = []
+        
+        for word in words:
+            current_line.append(word)
+            line_width = font.getlength(' '.join(current_line))
+            
+            if line_width > max_width:
+                if len(current_line) == 1:
+                    lines.append(current_line[0])
+                    current_line = []
+                else:
+                    current_line.pop()
+                    lines.append(' '.join(current_line))
+                    current_line = [word]
+                    
+        if current_line:
+            lines.append(' '.join(current_line))
+            
+        return lines
+
+    def _draw_text_with_outline(self, draw, text, x, y, font, stroke_width):
+        """
+        Draw text with outline effect.
+        
+        In single-pass mode the line is drawn once: Pillow builds the stroked glyph
+        mask and composites the black outline and white fill in one call. The legacy
+        mode's four offset passes fall inside that stroke, so for stroke_width >= 3
+        both modes produce the same image; at stroke_width 2 they differ only by a
+        few levels on anti-aliased edge pixels.
+        
+        Args:
+            draw: PIL ImageDraw object
+            text (str): Text to draw
+            x, y (int): Coordinates for text placement
+            font: PIL ImageFont object
+            stroke_width (int): Width of the outline
+        """
+        if self.single_pass_outline:
+            draw.text(
+                (x, y),
+                text,
+                font=font,
+                fill="white",
+                stroke_width=stroke_width,
+                stroke_fill="black"
+            )
+            return
+
+        # Draw outline with smaller offset for smaller text
+        offsets = [(1, 1), (-1, -1), (1, -1), (-1, 1)]  # Reduced from 2 to 1
+        for offset_x, offset_y in offsets:
+            draw.text(
+                (x + offset_x, y + offset_y),
+                text,
+                font=font,
+                fill="black"
+            )
+        
+        # Draw main text
+        draw.text(
+            (x, y),
+            text,
+            font=font,
+            fill="white",
+            stroke_width=stroke_width,
+            stroke_fill="black"
+        )
+
 
 class MemeGenerator:
     """
@@ -16,13 +252,20 @@ class MemeGenerator:
     placement and styling.
     """
 
-    def __init__(self):
+    def __init__(self, single_pass_outline=True, archive=False):
         """
         Initialize the MemeGenerator with necessary configurations and API clients.
         Sets up directories, fonts, and API connections.
+        
+        Args:
+            single_pass_outline (bool): Rasterise each caption line once with a
+                stroked outline instead of the legacy five-pass outline
+            archive (bool): Also write every rendered meme to the memes/ directory
         """
+        self.archive = archive
         self._initialize_environment()
         self._setup_directories()
+        self.renderer = MemeRenderer(self.font_path, single_pass_outline)
         
     def _initialize_environment(self):
         """Set up API clients and load environment variables."""
@@ -32,6 +275,7 @@ class MemeGenerator:
             raise ValueError("GROQ_API_KEY environment variable is not set.")
         
         self.groq_client = Groq(api_key=api_key)
+        self.llm_cache = get_llm_cache()
         self.font_path = "fonts/DejaVuSans-Bold.ttf"
         
         if not os.path.exists(self.font_path):
@@ -40,46 +284,59 @@ class MemeGenerator:
             )
 
     def _setup_directories(self):
-        """Create necessary directories for storing generated memes."""
+        """Create necessary directories for archived memes and templates."""
         self.output_dir = "memes"
-        os.makedirs(self.output_dir, exist_ok=True)
+        if self.archive:
+            os.makedirs(self.output_dir, exist_ok=True)
+        self.template_store = TemplateStore()
+        self._template_index = None
+        self._indexed_catalogue = None
+        # create_memes prepares memes on many threads; they must share one index
+        self._template_lock = threading.Lock()
 
-    def get_meme_template(self):
+    def get_meme_template(self, orientation="landscape"):
         """
-        Fetch a random meme template from the Imgflip API.
+        Pick a meme template from the cached Imgflip catalogue.
         
+        The catalogue is indexed by orientation once, so picks are O(1) and do not
+        repeat until every matching template has been used.
+        
+        Args:
+            orientation (str): 'landscape' or 'portrait'
+            
         Returns:
-            tuple: (template_url, width, height) or (None, None, None) if failed
+            dict: Template entry (id, url, width, height, ...) or None if no template matches
         """
         try:
-            response = requests.get("https://api.imgflip.com/get_memes")
-            response.raise_for_status()
-            memes = response.json().get('data', {}).get('memes', [])
+            memes = self.template_store.get_catalogue()
 
             if not memes:
                 print("No meme templates found.")
-                return None, None, None
+                return None
 
-            # Keep selecting templates until we find one in landscape orientation
-            while True:
-                template = random.choice(memes)
-                width, height = template['width'], template['height']
-                
-                # Check for landscape orientation (width significantly larger than height)
-                if width >= height:
-                    return template['url'], width, height
+            with self._template_lock:
+                if memes is not self._indexed_catalogue:
+                    self._template_index = TemplateIndex(memes)
+                    self._indexed_catalogue = memes
+                template_index = self._template_index
+
+            template = template_index.select(orientation)
+            if not template:
+                print(f"No {orientation} meme template matches.")
+            return template
                 
         except requests.RequestException as e:
             print(f"Failed to fetch meme template: {e}")
-            return None, None, None
+            return None
 
-    def generate_meme_text(self, trend, company_theme="Resume Building"):
+    def generate_meme_text(self, trend, company_theme="Resume Building", fresh=False):
         """
         Generate two lines of Hinglish meme text using Groq API.
         
         Args:
             trend (str): The trending topic to base the meme on
             company_theme (str): Theme for contextualizing the meme
+            fresh (bool): Bypass the LLM response cache for a new caption
             
         Returns:
             tuple: (top_text, bottom_text)
@@ -92,20 +349,123 @@ class MemeGenerator:
                 Provide only the text itself—no prefixes, labels, or extra formatting.
             """
             
-            response = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
+            text = self.llm_cache.complete(
+                self.groq_client,
+                prompt,
                 model="llama-3.1-70b-versatile",
                 temperature=0.7,
                 max_tokens=100,
-            )
-            
-            text = response.choices[0].message.content.strip()
+                fresh=fresh,
+            ).strip()
             return self._process_generated_text(text)
             
         except Exception as e:
             print(f"Error generating meme text: {e}")
             return "Error generating meme text.", "Please try again."
 
+    def generate_meme_content(self, trend, company_theme="Resume Building", theme="career",
+                              fresh=True):
+        """
+        Generate the meme captions and its hashtags in a single structured Groq call.
+        
+        Args:
+            trend (str): The trending topic to base the meme on
+            company_theme (str): Theme for contextualizing the meme
+            theme (str): Theme the hashtags should relate to
+            fresh (bool): Bypass the LLM response cache for new content. On by
+                default: the hashtags are tweeted as is, and a repeated topic's
+                cached text would be rejected by Twitter as a duplicate status
+            
+        Returns:
+            dict: {'top_text', 'bottom_text', 'hashtags'} or None if the response
+                did not match the schema
+        """
+        try:
+            prompt = f"""
+                Generate a hinglish style humorous and very funny two-line meme text that relates to the trending topic "{trend}" and 
+                incorporates the theme of "{company_theme}". Ensure that the text is witty and relevant to
+                job searching or resume building.
+                Also generate 4-5 relevant hashtags for a social media post about '{trend}' related to {theme}:
+                at least one trending or popular hashtag, one specific to the topic, all commonly used on social media.
+                
+                Respond with only a JSON object with exactly these keys:
+                {{"top_text": "<first meme line>", "bottom_text": "<second meme line>", "hashtags": ["#Career", "#JobTips"]}}
+            """
+            
+            content = self.llm_cache.complete(
+                self.groq_client,
+                prompt,
+                model="llama-3.1-70b-versatile",
+                temperature=0.7,
+                max_tokens=200,
+                fresh=fresh,
+                validate=self._parse_meme_content,
+                response_format={"type": "json_object"},
+            )
+            
+            return self._parse_meme_content(content)
+            
+        except Exception as e:
+            print(f"Error generating structured meme content: {e}")
+            return None
+
+    def _parse_meme_content(self, text):
+        """
+        Validate a structured meme response against its schema.
+        
+        Args:
+            text (str): Raw JSON response
+            
+        Returns:
+            dict: {'top_text', 'bottom_text', 'hashtags'} with hashtags as a
+                space-separated string
+            
+        Raises:
+            ValueError: If the response is not valid JSON or does not match the schema
+        """
+        data = json.loads(text)
+        if not isinstance(data, dict) or set(data) != {'top_text', 'bottom_text', 'hashtags'}:
+            raise ValueError(f"Unexpected keys in meme content: {text}")
+
+        top_text, bottom_text, hashtags = data['top_text'], data['bottom_text'], data['hashtags']
+        if not all(isinstance(line, str) and line.strip() for line in (top_text, bottom_text)):
+            raise ValueError("Meme lines must be non-empty strings")
+
+        if not isinstance(hashtags, list) or not 1 <= len(hashtags) <= 8:
+            raise ValueError("Hashtags must be a list of 1-8 tags")
+        tags = []
+        for tag in hashtags:
+            tag = tag.strip().lstrip('#') if isinstance(tag, str) else ''
+            if not tag or any(char.isspace() for char in tag):
+                raise ValueError(f"Invalid hashtag: {tag!r}")
+            tags.append('#' + tag)
+
+        return {
+            'top_text': top_text.strip(),
+            'bottom_text': bottom_text.strip(),
+            'hashtags': ' '.join(tags)
+        }
+
+    def generate_captions(self, trend, company_theme="Resume Building", with_hashtags=False):
+        """
+        Generate meme captions, and optionally hashtags, with as few LLM calls as possible.
+        
+        With hashtags requested, one structured call is tried first; if its response
+        does not parse, this falls back to the plain caption call and leaves the
+        hashtags for the caller to generate separately.
+        
+        Returns:
+            tuple: (top_text, bottom_text, hashtags) where hashtags may be None
+        """
+        if with_hashtags:
+            content = self.generate_meme_content(trend, company_theme)
+            if content:
+                return content['top_text'], content['bottom_text'], content['hashtags']
+            print("Falling back to separate caption and hashtag calls.")
+
+        top_text, bottom_text = self.generate_meme_text(trend, company_theme)
+        return top_text, bottom_text, None
+
     def _process_generated_text(self, text):
         """
         Process the generated text into two lines.
@@ -134,183 +494,162 @@ class MemeGenerator:
         
         return lines[0], lines[1] if len(lines) > 1 else "Please try again"
 
-    def _calculate_font_size(self, img, text, max_width_ratio=0.80):
+    def create_meme(self, trend, company_theme="Resume Building"):
         """
-        Calculate the optimal font size for the given text and image dimensions.
-        Sizes are now smaller compared to the original version.
+        Create a meme by combining template and generated text.
         
         Args:
-            img: PIL Image object
-            text (str): Text to be rendered
-            max_width_ratio (float): Maximum width ratio for text
+            trend (str): Trending topic for the meme
+            company_theme (str): Theme for contextualizing the meme
             
         Returns:
-            int: Optimal font size
+            dict: Rendered meme ('data', 'mime_type', 'path'), or None if failed
         """
-        # Reduced size percentages for smaller text
-        initial_size = int(img.height * 0.12)  # Reduced from 0.15
-        min_size = int(img.height * 0.06)      # Reduced from 0.08
-        max_size = int(img.height * 0.15)      # Reduced from 0.20
-        
-        font_size = min(initial_size, max_size)
-        
-        while font_size > min_size:
-            font = ImageFont.truetype(self.font_path, font_size)
-            if font.getlength(text) <= (img.width * max_width_ratio):
-                break
-            font_size -= 2
-            
-        return font_size
+        try:
+            prepared = self._prepare_meme(trend, company_theme)
+            if not prepared:
+                return None
+            render_args, _ = prepared
+            return self.renderer.render(*render_args)
 
-    def _wrap_text(self, text, font, max_width):
+        except Exception as e:
+            print(f"Error creating meme: {e}")
+            return None
+
+    def create_memes(self, items, company_theme="Resume Building", max_workers=None, io_workers=8,
+                     with_hashtags=False):
         """
-        Wrap text to fit within the specified width.
+        Create memes for many topics at once.
+        
+        Template downloads and LLM captions run concurrently on a thread pool, and
+        each meme is handed to a process pool for rendering as soon as its inputs
+        are ready, so the CPU-bound Pillow work spreads across cores.
         
         Args:
-            text (str): Text to wrap
-            font: PIL ImageFont object
-            max_width (int): Maximum width in pixels
+            items (list): Trending topics, either strings or dicts with a 'trend'
+                key and an optional 'company_theme'
+            company_theme (str): Theme used for items that do not set one
+            max_workers (int): Render processes (defaults to the CPU count)
+            io_workers (int): Threads for template and LLM calls
+            with_hashtags (bool): Also generate hashtags, in the same LLM call as
+                the captions where possible
             
         Returns:
-            list: Lines of wrapped text
+            list: One dict per item, in input order, with 'trend', 'top_text',
+                'bottom_text', 'hashtags' and 'meme' (the rendered meme as returned
+                by create_meme, or None if that item failed; 'hashtags' is None
+                if not generated)
         """
-        words = text.split()
-        lines = []
-        current_line = []
-        
-        for word in words:
-            current_line.append(word)
-            line_width = font.getlength(' '.join(current_line))
-            
-            if line_width > max_width:
-                if len(current_line) == 1:
-                    lines.append(current_line[0])
-                    current_line = []
-                else:
-                    current_line.pop()
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
-                    
-        if current_line:
-            lines.append(' '.join(current_line))
-            
-        return lines
+        results = []
+        for item in items:
+            if isinstance(item, dict):
+                results.append({
+                    'trend': item['trend'],
+                    'company_theme': item.get('company_theme', company_theme),
+                })
+            else:
+                results.append({'trend': item, 'company_theme': company_theme})
+            results[-1].update(
+                {'top_text': None, 'bottom_text': None, 'hashtags': None, 'meme': None})
 
-    def _draw_text_with_outline(self, draw, text, x, y, font, stroke_width):
-        """
-        Draw text with outline effect.
-        
-        Args:
-            draw: PIL ImageDraw object
-            text (str): Text to draw
-            x, y (int): Coordinates for text placement
-            font: PIL ImageFont object
-            stroke_width (int): Width of the outline
-        """
-        # Draw outline with smaller offset for smaller text
-        offsets = [(1, 1), (-1, -1), (1, -1), (-1, 1)]  # Reduced from 2 to 1
-        for offset_x, offset_y in offsets:
-            draw.text(
-                (x + offset_x, y + offset_y),
-                text,
-                font=font,
-                fill="black"
-            )
-        
-        # Draw main text
-        draw.text(
-            (x, y),
-            text,
-            font=font,
-            fill="white",
-            stroke_width=stroke_width,
-            stroke_fill="black"
-        )
+        if not results:
+            return results
 
-    def create_meme(self, trend, company_theme="Resume Building"):
+        with ThreadPoolExecutor(max_workers=io_workers) as io_pool, \
+                render_process_pool(max_workers) as render_pool:
+            prepare_futures = {
+                io_pool.submit(self._prepare_meme, result['trend'],
+                               result['company_theme'], with_hashtags): index
+                for index, result in enumerate(results)
+            }
+
+            render_futures = {}
+            for future in as_completed(prepare_futures):
+                index = prepare_futures[future]
+                try:
+                    prepared = future.result()
+                except Exception as e:
+                    print(f"Error preparing meme for '{results[index]['trend']}': {e}")
+                    continue
+                if not prepared:
+                    continue
+
+                render_args, hashtags = prepared
+                _, top_text, bottom_text, _ = render_args
+                results[index]['top_text'] = top_text
+                results[index]['bottom_text'] = bottom_text
+                results[index]['hashtags'] = hashtags
+                render_futures[index] = render_pool.submit(self.renderer.render, *render_args)
+
+            for index, future in sorted(render_futures.items()):
+                try:
+                    results[index]['meme'] = future.result()
+                except Exception as e:
+                    print(f"Error rendering meme for '{results[index]['trend']}': {e}")
+
+        return results
+
+    def _prepare_meme(self, trend, company_theme, with_hashtags=False):
         """
-        Create a meme by combining template and generated text.
+        Do the network-bound part of meme creation: template, image and captions.
         
         Args:
             trend (str): Trending topic for the meme
             company_theme (str): Theme for contextualizing the meme
+            with_hashtags (bool): Also try to generate hashtags in the caption call
             
         Returns:
-            str: Path to the generated meme file, or None if failed
+            tuple: ((image_bytes, top_text, bottom_text, archive_path), hashtags) or
+                None if no template matches
         """
-        template_url, width, height = self.get_meme_template()
-        if not template_url:
+        image_bytes = self.fetch_template_image()
+        if not image_bytes:
             return None
 
-        try:
-            # Load and prepare image
-            response = requests.get(template_url)
-            response.raise_for_status()
-            img = Image.open(BytesIO(response.content))
-            
-            # Ensure minimum image size
-            min_size = 800
-            if img.width < min_size or img.height < min_size:
-                ratio = max(min_size / img.width, min_size / img.height)
-                new_size = (int(img.width * ratio), int(img.height * ratio))
-                img = img.resize(new_size, Image.Resampling.LANCZOS)
-
-            # Generate text and prepare drawing
-            top_text, bottom_text = self.generate_meme_text(trend, company_theme)
-            draw = ImageDraw.Draw(img)
-            
-            # Calculate text parameters
-            longest_text = max(top_text, bottom_text, key=len)
-            font_size = self._calculate_font_size(img, longest_text)
-            font = ImageFont.truetype(self.font_path, font_size)
-            
-            # Calculate layout parameters with adjusted margins
-            margin = int(img.height * 0.06)  # Increased from 0.05 for better spacing
-            max_text_width = img.width - (2 * margin)
-            line_height = int(font_size * 1.3)  # Reduced from 1.4 for tighter spacing
-            stroke_width = max(2, int(font_size * 0.04))  # Reduced from 0.05
-
-            # Draw top text
-            y_position = margin
-            for line in self._wrap_text(top_text, font, max_text_width):
-                x_position = (img.width - font.getlength(line)) // 2
-                self._draw_text_with_outline(draw, line, x_position, y_position, font, stroke_width)
-                y_position += line_height
-
-            # Draw bottom text
-            bottom_lines = self._wrap_text(bottom_text, font, max_text_width)
-            y_position = img.height - margin - (len(bottom_lines) * line_height)
-            for line in bottom_lines:
-                x_position = (img.width - font.getlength(line)) // 2
-                self._draw_text_with_outline(draw, line, x_position, y_position, font, stroke_width)
-                y_position += line_height
-
-            # Save the meme
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{self.output_dir}/meme_{trend.split()[0].replace(' ', '_')}_{timestamp}.png"
-            img.save(filename)
-            return filename
+        top_text, bottom_text, hashtags = self.generate_captions(
+            trend, company_theme, with_hashtags)
+        return (image_bytes, top_text, bottom_text, self.archive_path(trend)), hashtags
 
-        except Exception as e:
-            print(f"Error creating meme: {e}")
+    def fetch_template_image(self):
+        """
+        Pick a template and return its image bytes from the template store.
+        
+        Returns:
+            bytes: Encoded template image, or None if no template matches
+        """
+        template = self.get_meme_template()
+        if not template:
+            return None
+        return self.template_store.get_image(template)
+
+    def archive_path(self, trend):
+        """
+        Build a unique archive path (without extension) for a meme about the topic.
+        
+        Returns:
+            str: The path, or None when archiving is disabled
+        """
+        if not self.archive:
             return None
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        return f"{self.output_dir}/meme_{trend.split()[0].replace(' ', '_')}_{timestamp}"
 
     def run_demo(self):
         """Run a demonstration of the meme generation process."""
         print("\nRunning MemeGenerator Demo...")
         
         # Generate and save a meme
-        filename = self.create_meme("AI Trends", "Resume Building")
+        meme = self.create_meme("AI Trends", "Resume Building")
         
-        if filename:
-            print(f"Successfully generated meme: {filename}")
+        if meme:
+            print(f"Successfully generated meme: {meme['path'] or meme['mime_type']}")
         else:
             print("Failed to generate meme")
 
 
 if __name__ == "__main__":
     try:
-        generator = MemeGenerator()
+        generator = MemeGenerator(archive=True)
         generator.run_demo()
     except Exception as e:
         print(f"Error running MemeGenerator: {e}")
\ No newline at end of file
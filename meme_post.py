@@ -1,10 +1,17 @@
 import json
+import re
 import time
 import random
 import os
-from meme_generator import MemeGenerator
-from media import TwitterPoster
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from meme_generator import MemeGenerator, render_process_pool
+from media import TwitterPoster, is_invalid_media_error
+from media_queue import MediaQueue
 from groq import Groq
+from llm_cache import get_llm_cache
+from twitter_client import connection_summary
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -19,11 +26,14 @@ class HashtagGenerator:
                 raise ValueError(
                     "GROQ_API_KEY environment variable not found.")
             self.groq_client = Groq(api_key=api_key)
+            self.llm_cache = get_llm_cache()
             print("HashtagGenerator initialized successfully.")
         except Exception as e:
             print(f"Error initializing HashtagGenerator: {str(e)}")
 
-    def generate_hashtags(self, topic, theme="career"):
+    def generate_hashtags(self, topic, theme="career", fresh=True):
+        # Fresh by default: the hashtags go straight into the tweet text, and
+        # Twitter rejects a repeated topic's cached text as a duplicate status.
         if isinstance(topic, dict):
             topic = topic.get('topic', '')
 
@@ -43,18 +53,18 @@ class HashtagGenerator:
 
         try:
             print("DEBUG: Sending request to Groq API...")
-            response = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
+            content = self.llm_cache.complete(
+                self.groq_client,
+                prompt,
                 model="llama-3.1-70b-versatile",
                 temperature=0.6,
                 max_tokens=100,
+                fresh=fresh,
             )
 
-            print(
-                f"DEBUG: Raw response content: {response.choices[0].message.content}")
+            print(f"DEBUG: Raw response content: {content}")
 
             try:
-                content = response.choices[0].message.content
                 if isinstance(content, str):
                     hashtags = content.strip()
                     formatted_hashtags = ' '.join(
@@ -74,31 +84,284 @@ class HashtagGenerator:
             print(f"DEBUG: Exception type: {type(e)}")
             return "#JobSearch #CareerTips #ResumeBuilder"
 
+    def generate_hashtags_batch(self, topics, theme="career", max_retries=1, fresh=True):
+        """
+        Generate hashtags for several topics in a single request.
+        
+        Fresh by default, like generate_hashtags, since the result is tweeted as
+        is; pass fresh=False to reuse cached responses.
+        
+        The response is parsed back per topic by its index; topics whose entry is
+        missing or malformed are retried together, and any still failing after
+        `max_retries` get the default hashtags.
+        
+        Returns:
+            list: Hashtag strings aligned with `topics`
+        """
+        topics = [
+            topic.get('topic', '') if isinstance(topic, dict) else topic
+            for topic in topics
+        ]
+        results = [None] * len(topics)
+        pending = list(range(len(topics)))
+
+        for attempt in range(max_retries + 1):
+            if not pending:
+                break
+            print(
+                f"Generating hashtags for {len(pending)} topics in one request "
+                f"(attempt {attempt + 1})")
+            parsed = self._request_hashtag_batch([topics[i] for i in pending], theme, fresh)
+            still_pending = []
+            for position, index in enumerate(pending):
+                hashtags = parsed.get(position + 1)
+                if hashtags:
+                    results[index] = hashtags
+                else:
+                    still_pending.append(index)
+            pending = still_pending
+            # A retry must not be answered with the same cached response
+            fresh = True
+
+        for index in pending:
+            print(f"Using default hashtags for topic: {topics[index]}")
+            results[index] = "#JobSearch #CareerTips #ResumeBuilder"
+        return results
+
+    @staticmethod
+    def _parse_json_object(content):
+        """Parse a JSON-mode response, raising ValueError unless it is an object."""
+        data = json.loads(content)
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected a JSON object, got: {content}")
+        return data
+
+    def _request_hashtag_batch(self, topics, theme, fresh):
+        """Ask for hashtags for numbered topics and return {number: hashtags} for valid entries."""
+        numbered = "\n".join(f"{number}. {topic}" for number, topic in enumerate(topics, 1))
+        prompt = f"""
+        Generate 4-5 relevant hashtags for a social media post about each of these topics, related to {theme}:
+        {numbered}
+        
+        For every topic the hashtags should be:
+        1. Relevant to careers, job search, and professional development
+        2. Include at least one trending or popular hashtag
+        3. Include one specific to the topic
+        4. Be commonly used on social media
+        
+        Respond with only a JSON object mapping each topic number to a single line of
+        hashtags separated by spaces.
+        Example format: {{"1": "#Career #JobTips #TechJobs", "2": "#AI #FutureOfWork #Careers"}}
+        """
+
+        try:
+            content = self.llm_cache.complete(
+                self.groq_client,
+                prompt,
+                model="llama-3.1-70b-versatile",
+                temperature=0.6,
+                max_tokens=40 * len(topics) + 50,
+                fresh=fresh,
+                validate=self._parse_json_object,
+                response_format={"type": "json_object"},
+            )
+            data = self._parse_json_object(content)
+        except Exception as e:
+            print(f"DEBUG: Exception in generate_hashtags_batch: {str(e)}")
+            return {}
+
+        parsed = {}
+        for number, hashtags in data.items():
+            if not str(number).strip().isdigit() or not isinstance(hashtags, str):
+                continue
+            tags = re.findall(r"#?(\w+)", hashtags)
+            if tags:
+                parsed[int(number)] = ' '.join('#' + tag for tag in tags)
+        return parsed
+
 
 def generate_all_memes(meme_gen, hashtag_gen, trending_topics, company_theme):
-    """Generate memes for all topics and return their paths with generated hashtags."""
+    """Generate memes for all topics and return them in memory with generated hashtags."""
+    topics = [
+        article['title'] if isinstance(article, dict) else article
+        for article in trending_topics
+    ]
+    print(f"Generating memes for {len(topics)} topics...")
+    results = meme_gen.create_memes(topics, company_theme, with_hashtags=True)
+
+    # Hashtags for any topic whose combined caption call failed, in one request
+    missing = [
+        result for result in results
+        if result['meme'] and not result['hashtags']
+    ]
+    if missing:
+        batch_hashtags = hashtag_gen.generate_hashtags_batch(
+            [result['trend'] for result in missing])
+        for result, hashtags in zip(missing, batch_hashtags):
+            result['hashtags'] = hashtags
+
     meme_data = []
-    for article in trending_topics:  # Corrected to iterate over 'articles'
-        try:
-            print(f"Generating meme for topic: {article['title']}")
-            topic = article['title']  # Using 'title' from the article dict
+    for result in results:
+        topic = result['trend']
+        meme = result['meme']
+        if not meme:
+            print(f"Failed to generate meme for topic: {topic}")
+            continue
+
+        meme_data.append({
+            'topic': topic,
+            'meme': meme,
+            'hashtags': result['hashtags']
+        })
+        print(f"Meme generated ({describe_meme(meme)}) with hashtags: {result['hashtags']}")
+    return meme_data
 
-            meme_path = meme_gen.create_meme(topic, company_theme)
 
-            if not meme_path:
-                print(f"Failed to generate meme for topic: {topic}")
+def describe_meme(meme):
+    """Short description of a rendered meme for log lines."""
+    description = f"{len(meme['data']) / 1024:.0f} KB {meme['mime_type']}"
+    if meme['path']:
+        description += f", archived at {meme['path']}"
+    return description
+
+
+_STAGE_DONE = object()
+
+
+async def _run_stage(name, inbox, outbox, handler, workers):
+    """
+    Run `workers` consumers that pass each item through `handler`.
+    
+    Queues are bounded, so a slow stage blocks the one feeding it (back-pressure)
+    instead of letting work pile up in memory. Items for which the handler fails
+    or returns None are dropped; the stage signals completion downstream once all
+    of its workers have drained the inbox.
+    """
+    async def worker():
+        while True:
+            item = await inbox.get()
+            if item is _STAGE_DONE:
+                # Put the sentinel back so sibling workers stop too
+                await inbox.put(_STAGE_DONE)
+                return
+            try:
+                result = await handler(item)
+            except Exception as e:
+                print(f"Error in {name} stage for topic '{item['topic']}': {str(e)}")
                 continue
+            if result is not None and outbox is not None:
+                await outbox.put(result)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    if outbox is not None:
+        await outbox.put(_STAGE_DONE)
+
+
+async def generate_all_memes_async(meme_gen, hashtag_gen, trending_topics, company_theme,
+                                   imgflip_concurrency=4, groq_concurrency=4,
+                                   render_workers=None, queue_size=4):
+    """
+    Generate memes for all topics as a staged asyncio pipeline.
+    
+    Topics flow through template fetch -> caption -> render -> hashtags, where the
+    hashtag stage only calls Groq if the combined caption call did not. Imgflip
+    and Groq calls run in threads, bounded per upstream, and rendering runs in a
+    process pool, so total time tracks the slowest item rather than the sum.
+    Returns the same list of {'topic', 'meme', 'hashtags'} dicts as
+    generate_all_memes, in topic order.
+    """
+    topics = [
+        article['title'] if isinstance(article, dict) else article
+        for article in trending_topics
+    ]
+    print(f"Generating memes for {len(topics)} topics with the async pipeline...")
+
+    loop = asyncio.get_running_loop()
+    render_workers = render_workers or os.cpu_count() or 1
+    groq_limit = asyncio.Semaphore(groq_concurrency)
+    template_queue, caption_queue, render_queue, hashtag_queue = (
+        asyncio.Queue(maxsize=queue_size) for _ in range(4))
+    finished = {}
+
+    async def feed():
+        for index, topic in enumerate(topics):
+            await template_queue.put({'index': index, 'topic': topic})
+        await template_queue.put(_STAGE_DONE)
+
+    async def fetch_template(item):
+        item['image_bytes'] = await asyncio.to_thread(meme_gen.fetch_template_image)
+        if not item['image_bytes']:
+            print(f"Failed to generate meme for topic: {item['topic']}")
+            return None
+        return item
+
+    async def write_caption(item):
+        async with groq_limit:
+            item['top_text'], item['bottom_text'], item['hashtags'] = await asyncio.to_thread(
+                meme_gen.generate_captions, item['topic'], company_theme, True)
+        return item
+
+    async def render(item):
+        item['meme'] = await loop.run_in_executor(
+            render_pool, meme_gen.renderer.render, item.pop('image_bytes'),
+            item['top_text'], item['bottom_text'], meme_gen.archive_path(item['topic']))
+        return item
+
+    async def add_hashtags(item):
+        if not item['hashtags']:
+            async with groq_limit:
+                item['hashtags'] = await asyncio.to_thread(
+                    hashtag_gen.generate_hashtags, item['topic'])
+        finished[item['index']] = item
+        print(
+            f"Meme generated ({describe_meme(item['meme'])}) with hashtags: {item['hashtags']}")
+
+    with render_process_pool(render_workers) as render_pool:
+        await asyncio.gather(
+            feed(),
+            _run_stage("template", template_queue, caption_queue,
+                       fetch_template, imgflip_concurrency),
+            _run_stage("caption", caption_queue, render_queue,
+                       write_caption, groq_concurrency),
+            _run_stage("render", render_queue, hashtag_queue,
+                       render, render_workers),
+            _run_stage("hashtag", hashtag_queue, None,
+                       add_hashtags, groq_concurrency),
+        )
+
+    return [
+        {
+            'topic': finished[index]['topic'],
+            'meme': finished[index]['meme'],
+            'hashtags': finished[index]['hashtags']
+        }
+        for index in sorted(finished)
+    ]
+
+
+def generate_memes_lazily(meme_gen, hashtag_gen, trending_topics, company_theme,
+                          buffer_size=1, generate=generate_all_memes):
+    """
+    Pick topics first and only generate the memes that may actually be posted.
+    
+    Topics are shuffled and generated `buffer_size` at a time until the buffer is
+    full, so a failed topic is replaced by the next one. Reports how many LLM
+    calls and renders were avoided versus generating every topic.
+    """
+    topics = list(trending_topics)
+    random.shuffle(topics)
 
-            hashtags = hashtag_gen.generate_hashtags(topic)
-            meme_data.append({
-                'topic': topic,
-                'path': meme_path,
-                'hashtags': hashtags
-            })
-            print(
-                f"Meme generated and saved at: {meme_path} with hashtags: {hashtags}")
-        except Exception as e:
-            print(f"Error generating meme for topic '{article['title']}': {str(e)}")
+    meme_data = []
+    attempted = 0
+    while len(meme_data) < buffer_size and attempted < len(topics):
+        batch = topics[attempted:attempted + buffer_size - len(meme_data)]
+        attempted += len(batch)
+        meme_data.extend(generate(meme_gen, hashtag_gen, batch, company_theme))
+
+    skipped = len(topics) - attempted
+    print(
+        f"Lazy mode generated {attempted} of {len(topics)} topics: "
+        f"avoided {skipped} LLM calls and {skipped} renders")
     return meme_data
 
 
@@ -111,22 +374,14 @@ def post_random_meme(twitter, meme_data):
     try:
         selected_meme = random.choice(meme_data)
         topic = selected_meme['topic']
-        meme_path = selected_meme['path']
-        hashtags = selected_meme['hashtags']
-
-        tweet_text = f"📈 {topic}\n\n{hashtags}"
+        tweet_text = meme_tweet_text(selected_meme)
         print(f"Posting meme for topic: {topic} with text: {tweet_text}")
 
-        success = twitter.post_tweet(meme_path, tweet_text)
+        success = twitter.post_tweet(selected_meme['meme'], tweet_text)
 
         if success:
             print(f"Successfully posted meme for topic: {topic}")
             meme_data.remove(selected_meme)
-            try:
-                os.remove(meme_path)
-                print(f"Deleted used meme file: {meme_path}")
-            except Exception as e:
-                print(f"Error deleting meme file {meme_path}: {str(e)}")
         else:
             print(f"Failed to post meme for topic: {topic}")
         return success
@@ -136,11 +391,108 @@ def post_random_meme(twitter, meme_data):
         return False
 
 
-def main():
+def meme_tweet_text(meme):
+    """Build the tweet text for a generated meme."""
+    return f"📈 {meme['topic']}\n\n{meme['hashtags']}"
+
+
+# Outcomes of post_preloaded_meme
+PRELOAD_POSTED = "posted"
+PRELOAD_EMPTY = "empty"
+PRELOAD_BLOCKED = "blocked"
+
+
+def post_preloaded_meme(twitter, media_queue):
+    """
+    Post the oldest meme whose image was uploaded by an earlier run.
+    
+    The post is a single create_tweet call. An entry is only removed once it is
+    posted or Twitter rejects its media ID, in which case the next one is
+    tried; any other failure (network, rate limit) leaves the queue untouched
+    for the next run.
+    
+    Returns:
+        str: PRELOAD_POSTED, PRELOAD_EMPTY if no usable upload was queued, or
+            PRELOAD_BLOCKED if posting failed and a fresh meme would fail too
+    """
+    while True:
+        entry = media_queue.peek()
+        if not entry:
+            return PRELOAD_EMPTY
+        print(f"Posting pre-uploaded meme for topic: {entry['topic']}")
+        try:
+            tweet_id = twitter.post_with_media_id(entry['text'], entry['media_id'])
+        except Exception as e:
+            if is_invalid_media_error(e):
+                print(f"Dropping rejected upload {entry['media_id']}: {e}")
+                media_queue.remove(entry)
+                continue
+            print(f"Error posting pre-uploaded meme, keeping the queue: {str(e)}")
+            return PRELOAD_BLOCKED
+
+        media_queue.remove(entry)
+        return PRELOAD_POSTED if tweet_id else PRELOAD_BLOCKED
+
+
+def preload_memes(twitter, media_queue, meme_data, count, upload_workers=4):
+    """
+    Upload up to `count` generated memes ahead of their posting slot.
+    
+    Uploads run concurrently and each media ID is queued with its expiry, so
+    the next run can post without waiting on a media upload.
+    """
+    candidates = meme_data[:max(0, count)]
+    if not candidates:
+        return 0
+
+    def upload(meme):
+        try:
+            return twitter.preupload(meme['meme'])
+        except Exception as e:
+            print(f"Error pre-uploading meme for topic {meme['topic']}: {str(e)}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=upload_workers) as executor:
+        uploads = list(executor.map(upload, candidates))
+
+    preloaded = 0
+    for meme, uploaded in zip(candidates, uploads):
+        if uploaded:
+            media_id, expires_at = uploaded
+            media_queue.add(media_id, expires_at, meme_tweet_text(meme), meme['topic'],
+                            path=meme['meme']['path'])
+            preloaded += 1
+    print(f"Pre-uploaded {preloaded} memes for upcoming posts ({len(media_queue)} queued)")
+    return preloaded
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate and post a tech meme.")
+    parser.add_argument(
+        "--pipeline", choices=["batch", "async"], default="batch",
+        help="batch renders with a process pool; async overlaps every stage per topic")
+    parser.add_argument(
+        "--lazy", action="store_true",
+        help="pick topics first and only generate memes that may be posted")
+    parser.add_argument(
+        "--buffer", type=int, default=1,
+        help="number of ready-to-post memes to keep in lazy mode; the ones not posted "
+             "are uploaded and queued for the next run")
+    parser.add_argument(
+        "--archive", action="store_true",
+        help="also keep every rendered meme in the memes/ directory")
+    parser.add_argument(
+        "--preload", type=int, default=0,
+        help="keep this many memes uploaded ahead of time so a post is a single API call")
+    return parser.parse_args()
+
+
+def main(args=None):
+    args = args or parse_args()
     try:
         print("Starting meme generation process...")
 
-        meme_gen = MemeGenerator()
+        meme_gen = MemeGenerator(archive=args.archive)
         twitter = TwitterPoster()
         hashtag_gen = HashtagGenerator()
         company_theme = "Resume Building"
@@ -161,23 +513,56 @@ def main():
                 "Tech Skills"
             ]
 
-        meme_data = generate_all_memes(
-            meme_gen, hashtag_gen, trending_topics, company_theme)
-
-        if not meme_data:
-            print("No memes were generated successfully. Exiting...")
+        if args.pipeline == "async":
+            def generate(*generate_args):
+                return asyncio.run(generate_all_memes_async(*generate_args))
+        else:
+            generate = generate_all_memes
+
+        # Memes kept uploaded for later runs: the preload target, or in lazy mode
+        # the buffered memes that are not posted this run
+        queue_size = args.preload
+        if args.lazy:
+            queue_size = max(queue_size, args.buffer - 1)
+
+        # Archived memes can be re-uploaded when their queued upload expires
+        media_queue = MediaQueue(refresh=twitter.preupload) if queue_size > 0 else None
+        preloaded = post_preloaded_meme(twitter, media_queue) if media_queue else PRELOAD_EMPTY
+        if preloaded == PRELOAD_BLOCKED:
+            # Generating and posting a new meme would hit the same failure after
+            # paying for the LLM calls and renders; the queue keeps its entry
+            print("Posting is blocked, skipping meme generation until the next run.")
+            print(connection_summary())
             return
+        if preloaded == PRELOAD_POSTED:
+            success = True
+            # Only generate what is needed to top the queue back up
+            needed = queue_size - len(media_queue)
+            meme_data = generate_memes_lazily(
+                meme_gen, hashtag_gen, trending_topics, company_theme,
+                buffer_size=needed, generate=generate) if needed > 0 else []
+        else:
+            if args.lazy:
+                meme_data = generate_memes_lazily(
+                    meme_gen, hashtag_gen, trending_topics, company_theme,
+                    buffer_size=max(1, args.buffer), generate=generate)
+            else:
+                meme_data = generate(
+                    meme_gen, hashtag_gen, trending_topics, company_theme)
 
-        print(f"Generated {len(meme_data)} memes successfully")
+            if not meme_data:
+                print("No memes were generated successfully. Exiting...")
+                return
 
-        success = post_random_meme(twitter, meme_data)
+            print(f"Generated {len(meme_data)} memes successfully")
 
-        for meme in meme_data:
-            try:
-                os.remove(meme['path'])
-                print(f"Cleaned up unused meme file: {meme['path']}")
-            except Exception as e:
-                print(f"Error cleaning up meme file {meme['path']}: {str(e)}")
+            success = post_random_meme(twitter, meme_data)
+
+        if media_queue:
+            preload_memes(twitter, media_queue, meme_data, queue_size - len(media_queue))
+
+        print(get_llm_cache().summary())
+        print(connection_summary())
 
         if success:
             print("Meme posting process completed successfully.")
@@ -0,0 +1,112 @@
+import time
+from contextlib import contextmanager
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Everything a wait needs in one round-trip to the browser: installs (once per
+# selector) an observer recording when a matching element was last added, then
+# reports the page state
+_SETTLE_SCRIPT = """
+const selector = arguments[0];
+if (!window.__contentObserver || window.__contentSelector !== selector) {
+    if (window.__contentObserver) {
+        window.__contentObserver.disconnect();
+    }
+    performance.setResourceTimingBufferSize(10000);
+    window.__contentSelector = selector;
+    window.__lastContentMutation = performance.now();
+    window.__contentObserver = new MutationObserver(records => {
+        for (const record of records) {
+            for (const node of record.addedNodes) {
+                if (node.nodeType === 1 && (node.matches(selector) || node.querySelector(selector))) {
+                    window.__lastContentMutation = performance.now();
+                    return;
+                }
+            }
+        }
+    });
+    window.__contentObserver.observe(document.documentElement, {childList: true, subtree: true});
+}
+
+const now = performance.now();
+let lastNetwork = 0;
+for (const entry of performance.getEntriesByType('resource')) {
+    lastNetwork = Math.max(lastNetwork, entry.responseEnd || entry.startTime);
+}
+return {
+    ready: document.readyState,
+    count: document.querySelectorAll(selector).length,
+    sinceMutation: now - window.__lastContentMutation,
+    sinceNetwork: now - lastNetwork
+};
+"""
+
+
+class ContentSettled:
+    """
+    WebDriverWait condition: content matching a selector has stopped changing.
+
+    The page is settled once the document has loaded, at least `min_count`
+    elements match, their count has not changed for `quiet` seconds, no
+    matching element was added in that time (MutationObserver) and no network
+    request finished in that time (Resource Timing). The result is the element
+    count, so a wait returns as soon as the content is ready instead of after
+    a fixed sleep.
+    """
+
+    def __init__(self, selector, min_count=1, quiet=0.5):
+        """
+        Args:
+            selector (str): CSS selector of the content being waited for
+            min_count (int): Elements required before the page can settle
+            quiet (float): Seconds without changes that count as settled
+        """
+        self.selector = selector
+        self.min_count = min_count
+        self.quiet = quiet
+        self.count = 0
+        self._stable_since = time.monotonic()
+
+    def __call__(self, driver):
+        state = driver.execute_script(_SETTLE_SCRIPT, self.selector)
+
+        now = time.monotonic()
+        if state["count"] != self.count:
+            self.count = state["count"]
+            self._stable_since = now
+
+        quiet_ms = self.quiet * 1000
+        settled = (
+            state["ready"] == "complete"
+            and self.count >= self.min_count
+            and now - self._stable_since >= self.quiet
+            and state["sinceMutation"] >= quiet_ms
+            and state["sinceNetwork"] >= quiet_ms
+        )
+        return self.count if settled else False
+
+
+def wait_for_content(driver, selector, min_count=1, quiet=0.5, timeout=10, poll_frequency=0.1):
+    """
+    Wait until content matching the selector has settled.
+
+    Returns:
+        int: Number of matching elements, or however many there were when the
+            timeout expired
+    """
+    condition = ContentSettled(selector, min_count=min_count, quiet=quiet)
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(condition)
+    except TimeoutException:
+        print(f"Timed out after {timeout}s waiting for {selector}, continuing with {condition.count}")
+        return condition.count
+
+
+@contextmanager
+def page_timer(label):
+    """Log how long a page took, so wait changes can be measured per page."""
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        print(f"[TIMING] {label}: {time.monotonic() - started:.2f}s")
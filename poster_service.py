@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import argparse
+from job_post import TwitterJobPoster, load_jobs
+
+
+class PosterService:
+    """
+    Long-running poster that replaces the one-shot cron scripts.
+
+    It keeps a single warm TwitterJobPoster (and its Tweepy client) for its whole
+    lifetime, so tweepy, groq and `.env` are loaded once instead of on every cron
+    tick. Every poll it finishes any thread left in the durable tweet queue, then
+    posts new jobs and text tweets on their own intervals. Because thread state
+    is persisted after every tweet, a restarted service resumes a half-posted
+    thread at its next reply.
+    """
+
+    def __init__(self, jobs_file="linkedin_jobs.json", jobs_interval=3600, max_jobs=5,
+                 text_interval=None, poll_interval=30):
+        """
+        Initialize the service and its warm clients.
+
+        Args:
+            jobs_file (str): Scraped jobs file to post from
+            jobs_interval (int): Seconds between job threads
+            max_jobs (int): Maximum number of jobs per thread
+            text_interval (int): Seconds between text tweets, or None to disable them
+            poll_interval (int): Seconds between queue checks
+        """
+        self.jobs_file = jobs_file
+        self.jobs_interval = jobs_interval
+        self.max_jobs = max_jobs
+        self.text_interval = text_interval
+        self.poll_interval = poll_interval
+
+        self.job_poster = TwitterJobPoster()
+        self.tweet_generator = None
+        if text_interval:
+            from text_post import TweetGenerator
+            self.tweet_generator = TweetGenerator()
+
+        self._next_jobs_run = 0
+        self._next_text_run = 0
+
+    def run_forever(self):
+        """Poll until interrupted, flushing the posted jobs history on exit."""
+        print("Poster service started.")
+        try:
+            while True:
+                self.run_once()
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            print("Poster service stopping...")
+        finally:
+            self.job_poster.close()
+
+    def run_once(self):
+        """Drain the tweet queue and run any task that is due."""
+        if not self.job_poster.twitter_client:
+            print("Twitter client not initialized")
+            return
+
+        try:
+            jobs_posted = self.job_poster.resume_pending_threads()
+            if jobs_posted:
+                print(f"Resumed queued threads, posted {jobs_posted} jobs")
+        except Exception as e:
+            print(f"Error resuming queued threads: {str(e)}")
+
+        now = time.time()
+        if now >= self._next_jobs_run:
+            self._next_jobs_run = now + self.jobs_interval
+            self._post_jobs()
+
+        if self.tweet_generator and now >= self._next_text_run:
+            self._next_text_run = now + self.text_interval
+            try:
+                self.tweet_generator.post_tweet()
+            except Exception as e:
+                print(f"Error posting text tweet: {str(e)}")
+
+        self.job_poster.posted_jobs_journal.sync()
+
+    def _post_jobs(self):
+        """Post a new thread of jobs from the scraped jobs file."""
+        if not os.path.exists(self.jobs_file):
+            print(f"JSON file not found: {self.jobs_file}")
+            return
+        try:
+            valid_jobs = load_jobs(self.jobs_file)
+            if not valid_jobs:
+                print("No valid jobs to post")
+                return
+            jobs_posted = self.job_poster.post_jobs_to_twitter(valid_jobs, self.max_jobs)
+            print(f"Successfully posted {jobs_posted} new jobs to Twitter")
+        except json.JSONDecodeError:
+            print("Error decoding JSON file")
+        except Exception as e:
+            print(f"Error posting to Twitter: {str(e)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the long-lived Twitter poster.")
+    parser.add_argument("--jobs-file", default="linkedin_jobs.json")
+    parser.add_argument("--jobs-interval", type=int, default=3600,
+                        help="seconds between job threads")
+    parser.add_argument("--max-jobs", type=int, default=5)
+    parser.add_argument("--text-interval", type=int, default=None,
+                        help="seconds between text tweets (disabled if unset)")
+    parser.add_argument("--poll-interval", type=int, default=30,
+                        help="seconds between tweet queue checks")
+    args = parser.parse_args()
+
+    PosterService(
+        jobs_file=args.jobs_file,
+        jobs_interval=args.jobs_interval,
+        max_jobs=args.max_jobs,
+        text_interval=args.text_interval,
+        poll_interval=args.poll_interval,
+    ).run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import time
+import random
+import threading
+from urllib.parse import urlparse
+
+
+class RateLimitTimeout(TimeoutError):
+    """The rate limit would not allow a call within the scheduler's maximum wait."""
+
+
+class PostingScheduler:
+    """
+    Token-bucket scheduler for Twitter write calls.
+
+    A local bucket (`rate` tokens per second, up to `burst`) spaces posts out,
+    and the quota reported in the API's rate-limit headers overrides it: posts go
+    out as fast as the remaining quota allows, and once it is spent callers wait
+    until the reported reset. 429 responses are retried with exponential backoff
+    and jitter. A call that would have to wait longer than `max_wait` in total
+    raises RateLimitTimeout instead, so one-shot cron runs do not hang until a
+    24-hour quota resets. Nothing here depends on tweepy, so it can be exercised
+    against a local fake endpoint with a plain `requests.Session`.
+    """
+
+    # (remaining, reset) header pairs; Twitter sends the 24-hour user cap on v2 writes
+    LIMIT_HEADERS = [
+        ("x-rate-limit-remaining", "x-rate-limit-reset"),
+        ("x-user-limit-24hour-remaining", "x-user-limit-24hour-reset"),
+        ("x-app-limit-24hour-remaining", "x-app-limit-24hour-reset"),
+    ]
+
+    def __init__(self, rate=0.5, burst=3, max_retries=3, base_backoff=5.0,
+                 max_backoff=900.0, max_wait=900.0, observed_endpoints=None,
+                 clock=time.time, sleep=time.sleep):
+        """
+        Configure the bucket; it starts full.
+
+        Args:
+            rate (float): Local refill rate in posts per second
+            burst (int): Maximum posts allowed back to back
+            max_retries (int): Retries for a call that hits 429
+            base_backoff (float): First backoff in seconds when no reset is known
+            max_backoff (float): Upper bound on any single wait
+            max_wait (float): Upper bound on the total wait of one acquire() or
+                call(), or None to wait as long as the quota requires
+            observed_endpoints (iterable): (method, path) pairs whose responses
+                carry the quota this scheduler paces, or None to trust every
+                response; keeps an attached session's other endpoints (such as
+                media uploads) from overwriting the posting quota
+            clock: Wall-clock function (reset headers are epoch seconds)
+            sleep: Sleep function, injectable for tests
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_wait = max_wait
+        self.observed_endpoints = (
+            None if observed_endpoints is None else set(observed_endpoints))
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._refilled_at = clock()
+        self._remaining = None
+        self._reset_at = None
+
+    def attach(self, client):
+        """Observe rate-limit headers on every response sent through a client's session."""
+        session = getattr(client, "session", None)
+        if session is not None and self.observe_response not in session.hooks["response"]:
+            session.hooks["response"].append(self.observe_response)
+        return client
+
+    def observe_response(self, response, *args, **kwargs):
+        """requests response hook: record the tightest quota the headers report."""
+        if self.observed_endpoints is not None:
+            request = getattr(response, "request", None)
+            endpoint = (getattr(request, "method", None),
+                        urlparse(getattr(request, "url", None) or "").path)
+            if endpoint not in self.observed_endpoints:
+                return response
+
+        headers = getattr(response, "headers", None) or {}
+        tightest = None
+        for remaining_header, reset_header in self.LIMIT_HEADERS:
+            try:
+                remaining = int(headers[remaining_header])
+                reset_at = float(headers[reset_header])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if tightest is None or remaining < tightest[0]:
+                tightest = (remaining, reset_at)
+
+        if tightest is not None:
+            with self._lock:
+                self._remaining, self._reset_at = tightest
+        return response
+
+    def acquire(self, max_wait=None):
+        """
+        Block until a post is allowed by both the quota and the local bucket.
+
+        Args:
+            max_wait (float): Longest total wait, defaulting to the scheduler's
+
+        Raises:
+            RateLimitTimeout: If the post would not be allowed within max_wait;
+                raised up front, without sleeping towards a deadline it cannot meet
+        """
+        if max_wait is None:
+            max_wait = self.max_wait
+        deadline = None if max_wait is None else self._clock() + max_wait
+        while True:
+            with self._lock:
+                now = self._clock()
+                if self._reset_at is not None and now >= self._reset_at:
+                    self._remaining, self._reset_at = None, None
+
+                if self._remaining is not None and self._remaining <= 0:
+                    wait = self._reset_at - now
+                else:
+                    self._tokens = min(
+                        self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+                    self._refilled_at = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        if self._remaining is not None:
+                            self._remaining -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+
+            if deadline is not None and now + wait > deadline:
+                raise RateLimitTimeout(
+                    f"Rate limit allows the next post in {wait:.0f}s, "
+                    f"more than the {max_wait:.0f}s maximum wait")
+            self._sleep(min(max(wait, 0.0), self.max_backoff))
+
+    def call(self, func, *args, **kwargs):
+        """
+        Run a write call under the scheduler, retrying on 429 responses.
+
+        Raises:
+            RateLimitTimeout: If waiting for the rate limit would take longer
+                than max_wait in total
+            Exception: Whatever `func` raised, once retries are exhausted or the
+                error is not a rate-limit response
+        """
+        deadline = None if self.max_wait is None else self._clock() + self.max_wait
+        for attempt in range(self.max_retries + 1):
+            self.acquire(None if deadline is None else max(0.0, deadline - self._clock()))
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                response = getattr(e, "response", None)
+                if getattr(response, "status_code", None) != 429 or attempt == self.max_retries:
+                    raise
+                self.observe_response(response)
+                delay = self._backoff(attempt)
+                if deadline is not None and self._clock() + delay > deadline:
+                    raise RateLimitTimeout(
+                        f"Rate limited by Twitter for longer than the "
+                        f"{self.max_wait:.0f}s maximum wait") from e
+                print(f"Rate limited by Twitter, retrying in {delay:.0f}s")
+                self._sleep(delay)
+
+    def _backoff(self, attempt):
+        """
+        Jittered delay before retrying a 429.
+
+        If the response reported a reset time, the quota is marked spent so the
+        next acquire() waits for the reset and only the jitter is returned;
+        otherwise the delay backs off exponentially.
+        """
+        jitter = random.uniform(0, self.base_backoff)
+        with self._lock:
+            if self._reset_at is not None:
+                self._remaining = 0
+                return jitter
+        return min(self.base_backoff * (2 ** attempt) + jitter, self.max_backoff)
+
+
+class HostThrottle:
+    """
+    Per-host politeness for scrapers sharing one process.
+
+    Each host gets its own single-token PostingScheduler, so requests to a host
+    are spaced at least `min_interval` seconds apart no matter how many workers
+    share the throttle, while different hosts do not wait on each other.
+    """
+
+    def __init__(self, min_interval=2.0, burst=1):
+        """
+        Args:
+            min_interval (float): Minimum seconds between requests to one host
+            burst (int): Requests allowed back to back before spacing applies
+        """
+        self.min_interval = min_interval
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._schedulers = {}
+
+    def wait(self, url):
+        """Block until a request to the URL's host is allowed."""
+        if self.min_interval <= 0:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            scheduler = self._schedulers.get(host)
+            if scheduler is None:
+                scheduler = PostingScheduler(
+                    rate=1.0 / self.min_interval, burst=self.burst, max_wait=None)
+                self._schedulers[host] = scheduler
+        scheduler.acquire()
+
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the process-wide posting scheduler shared by every poster."""
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            # Only tweet creation shares this quota; the v1.1 media API uses the
+            # same session but is limited separately
+            _default_scheduler = PostingScheduler(observed_endpoints=[("POST", "/2/tweets")])
+        return _default_scheduler
@@ -5,8 +5,15 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from chromedriver_setup import setup_driver
-import time
+from chromedriver_setup import managed_driver
+from rate_limiter import HostThrottle
+from page_waits import wait_for_content, page_timer
+from linkedin_guest import GuestJobFetcher
+from job_card_parser import clean_job_link
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+import argparse
+import queue
 import os
 import json
 from datetime import datetime
@@ -19,8 +26,37 @@ linkedin_password = os.getenv('LINKEDIN_PASSWORD')
 
 COMPANY_IDS_FILE = 'company_ids.json'
 JOBS_OUTPUT_FILE = 'linkedin_jobs.json'
-
-driver = setup_driver() 
+JOB_CARD_SELECTOR = '.job-card-container'
+
+# Reads every job card on the page in one round-trip, with the same selector
+# fallbacks as extract_job_data
+EXTRACT_JOB_CARDS_SCRIPT = """
+const text = (card, selectors) => {
+    for (const selector of selectors) {
+        const elem = card.querySelector(selector);
+        if (elem && elem.innerText) {
+            return elem.innerText.trim().split('\\n')[0];
+        }
+    }
+    return '';
+};
+const href = (card, selectors) => {
+    for (const selector of selectors) {
+        const elem = card.querySelector(selector);
+        if (elem && elem.href) {
+            return elem.href;
+        }
+    }
+    return '';
+};
+return Array.from(document.querySelectorAll(arguments[0]), card => ({
+    title: text(card, ['h3.base-search-card__title', 'a.job-card-container__link']),
+    link: href(card, ['a.base-card__full-link', 'a.job-card-container__link']),
+    company: text(card, ['h4.base-search-card__subtitle', '.artdeco-entity-lockup__subtitle']),
+    location: text(card, ['.job-search-card__location', '.job-card-container__metadata-item']),
+    urn: card.getAttribute('data-entity-urn') || ''
+}));
+"""
 
 def load_or_create_company_ids():
     """Load company IDs from JSON or create a new file if it doesn't exist"""
@@ -93,7 +129,29 @@ def login_to_linkedin(driver):
         print(f"Login failed: {str(e)}")
         return False
 
-from urllib.parse import urlparse
+def share_login(driver, cookies):
+    """Copy a logged-in browser's session cookies into another browser instead of logging in again"""
+    # Cookies can only be set for the domain the browser is currently on
+    driver.get("https://www.linkedin.com/")
+    for cookie in cookies:
+        try:
+            driver.add_cookie(cookie)
+        except Exception as e:
+            print(f"Could not share cookie {cookie.get('name')}: {e}")
+
+def extract_job_cards(driver):
+    """
+    Extract title, link, company and location for every job card on the page
+    with a single execute_script call, then canonicalise all links in one batch.
+    """
+    cards = driver.execute_script(EXTRACT_JOB_CARDS_SCRIPT, JOB_CARD_SELECTOR) or []
+    for card in cards:
+        entity_urn = card.pop('urn', '')
+        if card['link'] or entity_urn:
+            card['link'] = clean_job_link(card['link'], entity_urn)
+        else:
+            print(f"Link not found for job: {card['title']}")
+    return cards
 
 def extract_job_data(job_card):
     """Extract job details including title, link, location, and skills from a job card element."""
@@ -117,17 +175,11 @@ def extract_job_data(job_card):
         # Extract job link and clean it
         try:
             link_elem = job_card.find_element(By.CSS_SELECTOR, "a.base-card__full-link")
-            raw_link = link_elem.get_attribute('href')
-            parsed_url = urlparse(raw_link)  # Parse the URL
-            cleaned_link = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}"  # Reconstruct the base URL
-            job_data['link'] = cleaned_link
+            job_data['link'] = clean_job_link(link_elem.get_attribute('href'))
         except:
             try:
                 link_elem = job_card.find_element(By.CSS_SELECTOR, "a.job-card-container__link")
-                raw_link = link_elem.get_attribute('href')
-                parsed_url = urlparse(raw_link)
-                cleaned_link = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}"
-                job_data['link'] = cleaned_link
+                job_data['link'] = clean_job_link(link_elem.get_attribute('href'))
             except Exception as e:
                 print(f"Link not found: {e}")
 
@@ -165,8 +217,34 @@ def save_to_json(jobs_data):
         print(f"Error saving to JSON: {str(e)}")
         return False
 
-def scrape_jobs_for_company(driver, company_name, company_ids):
-    """Scrape jobs for a specific company using company ID"""
+def load_job_search_page(driver, url, max_scrolls=3):
+    """
+    Open a job search page and scroll until no new job cards arrive, waiting on
+    the page's content rather than fixed sleeps.
+
+    Returns:
+        int: Number of job cards loaded
+    """
+    driver.get(url)
+
+    # Wait until the first job cards have rendered and stopped changing
+    card_count = wait_for_content(driver, JOB_CARD_SELECTOR, timeout=10)
+
+    # Scroll through the page to load jobs until no new cards arrive
+    for _ in range(max_scrolls):
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        new_count = wait_for_content(driver, JOB_CARD_SELECTOR, min_count=0, timeout=5)
+        if new_count <= card_count:
+            break
+        card_count = new_count
+    return card_count
+
+def scrape_jobs_for_company(driver, company_name, company_ids, throttle=None, bulk_extract=True):
+    """
+    Scrape jobs for a specific company using company ID, waiting on the per-host
+    throttle if given. Job cards are read in one script call unless bulk_extract
+    is False, which falls back to per-element WebDriver lookups.
+    """
     try:
         # Get company ID, default to None if not found
         company_id = company_ids.get(company_name.lower())
@@ -184,31 +262,29 @@ def scrape_jobs_for_company(driver, company_name, company_ids):
         )
         
         # Navigate to the job search URL
-        driver.get(job_search_url)
-
-        # Wait for initial page load
-        time.sleep(5)
-
-        # Scroll through the page to load jobs
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        for _ in range(3):  # Scroll up to 3 times
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
-
-        # Find all job cards
-        job_cards = driver.find_elements(By.CLASS_NAME, "job-card-container")
-        
-        # Extract data from each job card
-        jobs_data = []
-        for job_card in job_cards:
-            job_data = extract_job_data(job_card)
-            if job_data:
-                job_data['company'] = company_name.capitalize()
-                jobs_data.append(job_data)
+        if throttle:
+            throttle.wait(job_search_url)
+
+        with page_timer(f"jobs page for {company_name}"):
+            load_job_search_page(driver, job_search_url)
+
+            if bulk_extract:
+                # Saved records keep the {title, link, company} shape
+                jobs_data = [
+                    {'title': card['title'], 'link': card['link'], 'company': company_name.capitalize()}
+                    for card in extract_job_cards(driver)
+                ]
+            else:
+                # Find all job cards
+                job_cards = driver.find_elements(By.CSS_SELECTOR, JOB_CARD_SELECTOR)
+                
+                # Extract data from each job card
+                jobs_data = []
+                for job_card in job_cards:
+                    job_data = extract_job_data(job_card)
+                    if job_data:
+                        job_data['company'] = company_name.capitalize()
+                        jobs_data.append(job_data)
         
         print(f"Scraped {len(jobs_data)} jobs for {company_name}")
         return jobs_data
@@ -217,38 +293,104 @@ def scrape_jobs_for_company(driver, company_name, company_ids):
         print(f"Error scraping jobs for {company_name}: {str(e)}")
         return []
 
-def main():
-    driver = None
+def scrape_companies(companies, company_ids, workers=3, min_interval=2.0, bulk_extract=True):
+    """
+    Scrape several companies at once with a bounded pool of logged-in browsers.
+
+    Only the first browser logs in; the others reuse its session cookies. Page
+    loads to a host are spaced at least `min_interval` seconds apart across all
+    workers. Jobs are returned in company order.
+    """
+    workers = max(1, min(workers, len(companies)))
+    throttle = HostThrottle(min_interval)
+    drivers = queue.Queue()
+
+    with ExitStack() as stack:
+        first_driver = stack.enter_context(managed_driver())
+        if not login_to_linkedin(first_driver):
+            raise Exception("Failed to login to LinkedIn")
+        print("Successfully logged in to LinkedIn")
+        drivers.put(first_driver)
+
+        cookies = first_driver.get_cookies()
+        for _ in range(workers - 1):
+            driver = stack.enter_context(managed_driver())
+            share_login(driver, cookies)
+            drivers.put(driver)
+
+        def scrape(company):
+            driver = drivers.get()
+            try:
+                print(f"Scraping jobs for {company}")
+                return scrape_jobs_for_company(driver, company, company_ids, throttle, bulk_extract)
+            finally:
+                drivers.put(driver)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(scrape, companies))
+
+    return [job for company_jobs in results for job in company_jobs]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape LinkedIn jobs for the companies in company_ids.json.")
+    parser.add_argument(
+        "--workers", type=int, default=3,
+        help="number of browsers scraping companies in parallel")
+    parser.add_argument(
+        "--min-interval", type=float, default=2.0,
+        help="minimum seconds between page loads to the same host")
+    parser.add_argument(
+        "--extraction", choices=["bulk", "elements"], default="bulk",
+        help="read job cards in one script call, or element by element")
+    parser.add_argument(
+        "--fetcher", choices=["selenium", "http"], default="selenium",
+        help="scrape with logged-in browsers, or fetch LinkedIn's guest job search over HTTP "
+             "(companies that fail over HTTP fall back to the browsers)")
+    return parser.parse_args()
+
+def main(args=None):
+    args = args or parse_args()
     try:
         # Load company IDs
         company_ids = load_or_create_company_ids()
         
         # List of companies to scrape (use keys from company_ids)
         companies = list(company_ids.keys())
-        
-        # All jobs will be collected here
-        all_companies_jobs = []
-
-        # Setup driver and login
-        driver = setup_driver()
-
-        if not login_to_linkedin(driver):
-            raise Exception("Failed to login to LinkedIn")
-
-        print("Successfully logged in to LinkedIn")
+        if not companies:
+            print("No companies to scrape")
+            return
 
-        # Scrape jobs for each company
-        for company in companies:
-            print(f"Scraping jobs for {company}")
-            
-            # Scrape jobs for current company
-            company_jobs = scrape_jobs_for_company(driver, company, company_ids)
-            
-            # Extend the all jobs list
-            all_companies_jobs.extend(company_jobs)
-            
-            # Add a small delay between company searches
-            time.sleep(3)
+        if args.fetcher == "http":
+            # No browser needed unless some company cannot be fetched over HTTP
+            fetcher = GuestJobFetcher(min_interval=args.min_interval)
+            try:
+                jobs_by_company, failed = fetcher.fetch_companies(
+                    companies, company_ids, workers=args.workers)
+            finally:
+                fetcher.close()
+
+            if failed:
+                print(f"Falling back to Selenium for {len(failed)} companies")
+                failed_by_name = {company.capitalize(): company for company in failed}
+                try:
+                    fallback_jobs = scrape_companies(
+                        failed, company_ids, workers=args.workers, min_interval=args.min_interval,
+                        bulk_extract=args.extraction == "bulk")
+                except Exception as e:
+                    # Still save what was fetched over HTTP
+                    print(f"Selenium fallback failed: {str(e)}")
+                    fallback_jobs = []
+                for job in fallback_jobs:
+                    jobs_by_company.setdefault(failed_by_name[job['company']], []).append(job)
+
+            all_companies_jobs = [
+                job for company in companies for job in jobs_by_company.get(company, [])
+            ]
+        else:
+            # Scrape every company with a pool of browsers sharing one login
+            all_companies_jobs = scrape_companies(
+                companies, company_ids, workers=args.workers, min_interval=args.min_interval,
+                bulk_extract=args.extraction == "bulk")
 
         # Save all jobs to a JSON file
         if all_companies_jobs:
@@ -258,9 +400,6 @@ def main():
 
     except Exception as e:
         print(f"An error occurred: {str(e)}")
-    finally:
-        if driver:
-            driver.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,10 +1,8 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import json
 from datetime import datetime
-import time
 from chromedriver_setup import setup_driver
+from page_waits import wait_for_content, page_timer
 
 class TechNewsScraper:
     def __init__(self):
@@ -25,13 +23,10 @@ class TechNewsScraper:
         for source in news_sources:
             try:
                 print(f"[DEBUG] Navigating to {source['url']}")
-                self.driver.get(source['url'])
-                time.sleep(2) 
-                print(f"[DEBUG] Waiting for elements with selector {source['title_selector']}")
-                
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, source['title_selector']))
-                )
+                with page_timer(source['url']):
+                    self.driver.get(source['url'])
+                    print(f"[DEBUG] Waiting for elements with selector {source['title_selector']}")
+                    wait_for_content(self.driver, source['title_selector'], timeout=10)
                 print(f"[DEBUG] Elements located on {source['url']}")
 
                 # Locate articles using the updated selector
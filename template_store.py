@@ -0,0 +1,249 @@
+import os
+import json
+import time
+import random
+import threading
+import requests
+
+
+class TemplateStore:
+    """
+    A local, on-disk store for Imgflip meme templates.
+
+    The template catalogue is kept with a TTL and revalidated with
+    ETag/If-Modified-Since once it goes stale. Template images are kept by
+    template id and evicted least-recently-used once the image directory grows
+    past a size budget. The store lives on disk so every `meme_post.py` run
+    started from cron shares it.
+    """
+
+    CATALOGUE_URL = "https://api.imgflip.com/get_memes"
+
+    def __init__(self, cache_dir="cache/templates", ttl=24 * 60 * 60,
+                 max_image_bytes=200 * 1024 * 1024):
+        """
+        Initialize the store and create its directories.
+
+        Args:
+            cache_dir (str): Directory holding the catalogue and template images
+            ttl (int): Seconds before the catalogue is revalidated upstream
+            max_image_bytes (int): Size budget for cached template images
+        """
+        self.cache_dir = cache_dir
+        self.image_dir = os.path.join(cache_dir, "images")
+        self.catalogue_path = os.path.join(cache_dir, "catalogue.json")
+        self.ttl = ttl
+        self.max_image_bytes = max_image_bytes
+        self._catalogue = None
+        # Serialises catalogue loads so concurrent callers share one fetch
+        self._lock = threading.Lock()
+        os.makedirs(self.image_dir, exist_ok=True)
+
+    def get_catalogue(self):
+        """
+        Return the template catalogue, hitting the network only when it is stale.
+
+        Returns:
+            list: Template dicts as returned by the Imgflip API
+
+        Raises:
+            requests.RequestException: If the catalogue cannot be fetched and
+                no cached copy exists
+        """
+        with self._lock:
+            return self._get_catalogue()
+
+    def _get_catalogue(self):
+        """get_catalogue without locking."""
+        if self._catalogue is None:
+            self._catalogue = self._read_json(self.catalogue_path)
+
+        cached = self._catalogue
+        if cached and time.time() - cached.get("fetched_at", 0) < self.ttl:
+            return cached["memes"]
+
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            response = requests.get(self.CATALOGUE_URL, headers=headers, timeout=30)
+            if response.status_code == 304 and cached:
+                cached["fetched_at"] = time.time()
+                self._write_json(self.catalogue_path, cached)
+                return cached["memes"]
+
+            response.raise_for_status()
+            self._catalogue = {
+                "fetched_at": time.time(),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "memes": response.json().get('data', {}).get('memes', []),
+            }
+            self._write_json(self.catalogue_path, self._catalogue)
+            return self._catalogue["memes"]
+
+        except requests.RequestException as e:
+            if cached:
+                print(f"Failed to revalidate meme templates, using cached copy: {e}")
+                return cached["memes"]
+            raise
+
+    def get_image(self, template):
+        """
+        Return the raw image bytes for a template, downloading it on a miss.
+
+        Args:
+            template (dict): Template entry from the catalogue
+
+        Returns:
+            bytes: Encoded template image
+
+        Raises:
+            requests.RequestException: If the image has to be downloaded and fails
+        """
+        path = self._image_path(template)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Bump the mtime so eviction sees this image as recently used
+            os.utime(path)
+            return data
+        except OSError:
+            pass
+
+        response = requests.get(template['url'], timeout=30)
+        response.raise_for_status()
+        data = response.content
+
+        self._write_bytes(path, data)
+        self._evict_images()
+        return data
+
+    def _image_path(self, template):
+        """Build the cache path for a template image, keyed by template id."""
+        extension = os.path.splitext(template['url'])[1] or ".img"
+        return os.path.join(self.image_dir, f"{template['id']}{extension}")
+
+    def _evict_images(self):
+        """Delete least-recently-used images until the cache fits its size budget."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.image_dir):
+            if not entry.is_file() or entry.name.endswith(".tmp"):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_image_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+
+    def _read_json(self, path):
+        """Read a JSON file, returning None if it is missing or unreadable."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_json(self, path, data):
+        """Atomically write JSON so concurrent cron runs never see a partial file."""
+        self._write_bytes(path, json.dumps(data).encode("utf-8"))
+
+    def _write_bytes(self, path, data):
+        """Atomically write bytes via a temporary file and rename."""
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+class TemplateIndex:
+    """
+    Catalogue templates pre-grouped by orientation and aspect-ratio bucket.
+
+    The catalogue is filtered once when the index is built. Selection pops from
+    a weighted, pre-shuffled deck per pool, so each pick is O(1) and no template
+    repeats until its pool has been exhausted. Selection is thread-safe.
+    """
+
+    def __init__(self, templates, bucket_size=0.25):
+        """
+        Build the index from a template catalogue.
+
+        Args:
+            templates (list): Template dicts as returned by the Imgflip API
+            bucket_size (float): Width of each aspect-ratio bucket
+        """
+        self.bucket_size = bucket_size
+        self._pools = {}
+        self._decks = {}
+        self._lock = threading.Lock()
+
+        for template in templates:
+            width, height = template.get('width'), template.get('height')
+            if not width or not height:
+                continue
+            key = (self.orientation(width, height), self.aspect_bucket(width, height))
+            self._pools.setdefault(key, []).append(template)
+
+    @staticmethod
+    def orientation(width, height):
+        """Return 'landscape' for templates at least as wide as they are tall."""
+        return "landscape" if width >= height else "portrait"
+
+    def aspect_bucket(self, width, height):
+        """Round a template's aspect ratio down to its bucket."""
+        return int((width / height) / self.bucket_size) * self.bucket_size
+
+    def select(self, orientation="landscape", aspect_bucket=None):
+        """
+        Pick a template matching the orientation (and optionally aspect bucket).
+
+        Args:
+            orientation (str): 'landscape' or 'portrait'
+            aspect_bucket (float): Restrict the pick to a single bucket
+
+        Returns:
+            dict: Template entry, or None if no template matches
+        """
+        key = (orientation, aspect_bucket)
+        with self._lock:
+            deck = self._decks.get(key)
+            if not deck:
+                deck = self._build_deck(orientation, aspect_bucket)
+                if not deck:
+                    return None
+                self._decks[key] = deck
+            return deck.pop()
+
+    def _build_deck(self, orientation, aspect_bucket):
+        """
+        Weighted shuffle of every matching template.
+
+        Popular templates (more Imgflip captions) tend to sit near the top of
+        the deck, but every template is drawn exactly once per pass.
+        """
+        candidates = [
+            template
+            for (pool_orientation, pool_bucket), pool in self._pools.items()
+            if pool_orientation == orientation
+            and (aspect_bucket is None or pool_bucket == aspect_bucket)
+            for template in pool
+        ]
+        # Efraimidis-Spirakis keys: sorting by u ** (1 / weight) is a weighted shuffle
+        candidates.sort(
+            key=lambda template: random.random() ** (1.0 / max(template.get('captions', 1), 1))
+        )
+        return candidates
@@ -0,0 +1,109 @@
+"""
+Benchmark caption font sizing in MemeRenderer before and after the font cache.
+
+"Before" is the original loop: ImageFont.truetype for every 2px step of
+_calculate_font_size, plus one more load for the chosen size. "After" is
+_calculate_font_size's binary search over load_font, measured with an empty
+font cache (a worker's first meme) and a warm one. Reports font loads and
+microseconds per caption, and checks both pick the same size.
+
+    python tests/bench_font_sizing.py
+"""
+import os
+import sys
+import time
+import argparse
+
+from PIL import Image, ImageFont
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from meme_generator import MemeRenderer, load_font
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), "..", "fonts", "DejaVuSans-Bold.ttf")
+CAPTIONS = [
+    "Me",
+    "HR after ghosting me",
+    "Resume bana liya, ab job kab milegi?",
+    "When the recruiter asks for 5 years of experience in a 2 year old framework",
+    "Mummy: beta naukri kab lagegi? Me, after applying to 300 jobs on LinkedIn this week",
+]
+IMAGE_SIZES = [(800, 800), (1200, 900), (800, 1400)]
+
+truetype = ImageFont.truetype
+loads = 0
+
+
+def counting_truetype(*args, **kwargs):
+    global loads
+    loads += 1
+    return truetype(*args, **kwargs)
+
+
+def legacy_font(img, text, max_width_ratio=0.80):
+    """The original _calculate_font_size loop and create_meme's final load."""
+    font_size = min(int(img.height * 0.12), int(img.height * 0.15))
+    min_size = int(img.height * 0.06)
+    while font_size > min_size:
+        font = ImageFont.truetype(FONT_PATH, font_size)
+        if font.getlength(text) <= (img.width * max_width_ratio):
+            break
+        font_size -= 2
+    return font_size, ImageFont.truetype(FONT_PATH, font_size)
+
+
+def cached_font(renderer, img, text):
+    font_size = renderer._calculate_font_size(img, text)
+    return font_size, load_font(FONT_PATH, font_size)
+
+
+def measure(size_font, cases, repeats, clear_cache):
+    """Return (font loads, microseconds) per caption for `size_font`."""
+    global loads
+    loads = 0
+    elapsed = 0.0
+    for _ in range(repeats):
+        for img, text in cases:
+            if clear_cache:
+                load_font.cache_clear()
+            start = time.perf_counter()
+            size_font(img, text)
+            elapsed += time.perf_counter() - start
+    runs = repeats * len(cases)
+    return loads / runs, elapsed / runs * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark caption font sizing.")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    renderer = MemeRenderer(FONT_PATH)
+    cases = [(Image.new("RGB", size), text) for size in IMAGE_SIZES for text in CAPTIONS]
+    for img, text in cases:
+        assert legacy_font(img, text)[0] == renderer._calculate_font_size(img, text), text
+
+    ImageFont.truetype = counting_truetype
+    try:
+        results = [
+            ("before (truetype per step)", measure(legacy_font, cases, args.repeats, False)),
+            ("after, cold font cache",
+             measure(lambda img, text: cached_font(renderer, img, text), cases, args.repeats, True)),
+        ]
+        load_font.cache_clear()
+        for img, text in cases:
+            cached_font(renderer, img, text)
+        results.append(("after, warm font cache",
+                        measure(lambda img, text: cached_font(renderer, img, text),
+                                cases, args.repeats, False)))
+    finally:
+        ImageFont.truetype = truetype
+
+    print(f"{len(cases)} captions x {args.repeats} repeats, font {os.path.basename(FONT_PATH)}")
+    print(f"{'':28} {'loads/caption':>14} {'us/caption':>11}")
+    for name, (loads_per_caption, micros) in results:
+        print(f"{name:28} {loads_per_caption:>14.2f} {micros:>11.1f}")
+    print(f"load_font cache: {load_font.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
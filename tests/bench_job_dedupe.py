@@ -0,0 +1,113 @@
+"""
+Benchmark filtering scraped jobs against the posted-jobs history.
+
+Compares, for the same history and candidates:
+  * the original linear scan: posted_jobs.json loaded, then is_job_posted
+    walking the whole list per candidate
+  * an in-memory set of links built from the loaded JSON (the first index)
+  * TwitterJobPoster.is_job_posted today: Bloom filter, then the SQLite index
+    for probable hits, with the filter and index already built by a prior run
+
+    python tests/bench_job_dedupe.py --history 100000 --candidates 5000
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def job_link(job_id):
+    return f"https://www.linkedin.com/jobs/view/{job_id}/"
+
+
+def history_records(size):
+    return [{
+        "job_link": job_link(job_id),
+        "job_title": f"Software Engineer {job_id % 97}",
+        "company_name": f"Company {job_id % 500}",
+        "tweet_id": str(1790000000000000000 + job_id),
+        "posted_at": "2024-05-02T10:00:00",
+    } for job_id in range(1, size + 1)]
+
+
+def linear_scan(legacy_path, links):
+    with open(legacy_path, "r", encoding="utf-8") as f:
+        posted_jobs = json.load(f)
+    return [
+        link for link in links
+        if any(posted_job["job_link"] == link for posted_job in posted_jobs["posted_jobs"])
+    ]
+
+
+def link_set(legacy_path, links):
+    with open(legacy_path, "r", encoding="utf-8") as f:
+        posted_links = {job["job_link"] for job in json.load(f)["posted_jobs"]}
+    return [link for link in links if link in posted_links]
+
+
+def journal_index(links):
+    from job_post import TwitterJobPoster
+    with contextlib.redirect_stdout(None):
+        poster = TwitterJobPoster()
+    try:
+        return [link for link in links if poster.is_job_posted(link)]
+    finally:
+        poster.close()
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark posted-job filtering.")
+    parser.add_argument("--history", type=int, default=100_000)
+    parser.add_argument("--candidates", type=int, default=5000)
+    parser.add_argument("--posted-share", type=float, default=0.5,
+                        help="fraction of candidates already in the history")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    posted = int(args.candidates * args.posted_share)
+    links = [job_link(rng.randint(1, args.history)) for _ in range(posted)]
+    links += [job_link(args.history + 1 + i) for i in range(args.candidates - posted)]
+    rng.shuffle(links)
+
+    records = history_records(args.history)
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        legacy_path = os.path.join(workdir, "legacy_posted_jobs.json")
+        with open(legacy_path, "w", encoding="utf-8") as f:
+            json.dump({"posted_jobs": records}, f, indent=2)
+        with open("posted_jobs.jsonl", "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+        # A previous run built the Bloom filter and index
+        build, _ = timed(journal_index, [])
+
+        results = [
+            ("linear scan of posted_jobs.json", *timed(linear_scan, legacy_path, links)),
+            ("set of links from posted_jobs.json", *timed(link_set, legacy_path, links)),
+            ("Bloom filter + SQLite index", *timed(journal_index, links)),
+        ]
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    expected = results[0][2]
+    print(f"{args.history:,} posted jobs, {args.candidates:,} candidates "
+          f"({posted:,} already posted); one-time Bloom/index build {build:.2f}s")
+    for name, seconds, found in results:
+        assert found == expected, name
+        print(f"{name:36} {seconds * 1000:>10.1f} ms {seconds / len(links) * 1e6:>9.1f} us/candidate")
+
+
+if __name__ == "__main__":
+    main()
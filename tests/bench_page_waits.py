@@ -0,0 +1,99 @@
+"""
+Benchmark job search page loading: fixed sleeps versus content-settled waits.
+
+Serves tests/fixtures/linkedin_jobs_search.html (a stand-in for LinkedIn's job
+search page that fetches result pages over XHR and loads more on scroll) from a
+local HTTP server with an artificial network latency, then loads it repeatedly
+with the original sleep-based scroll loop and with
+scrape_linkedinjobs.load_job_search_page, logging per-page timings and the
+cards each found.
+
+Needs Chrome and chromedriver, like the scrapers themselves.
+
+    python tests/bench_page_waits.py --runs 5 --latency 0.3
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from chromedriver_setup import managed_driver
+from page_waits import page_timer
+from scrape_linkedinjobs import JOB_CARD_SELECTOR, extract_job_cards, load_job_search_page
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class SlowFixtureHandler(SimpleHTTPRequestHandler):
+    """Serve the fixtures, delaying the XHR result pages by `latency` seconds."""
+
+    latency = 0.0
+
+    def do_GET(self):
+        if self.path.split("?")[0].endswith(".json"):
+            time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures(latency):
+    handler = type("Handler", (SlowFixtureHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(handler, directory=FIXTURES))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def load_with_sleeps(driver, url):
+    """The original scrape_jobs_for_company loop: fixed sleeps, scrollHeight checks."""
+    driver.get(url)
+    time.sleep(5)
+    last_height = driver.execute_script("return document.body.scrollHeight")
+    for _ in range(3):
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        time.sleep(2)
+        new_height = driver.execute_script("return document.body.scrollHeight")
+        if new_height == last_height:
+            break
+        last_height = new_height
+    return len(driver.find_elements("css selector", JOB_CARD_SELECTOR))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job search page waits.")
+    parser.add_argument("--runs", type=int, default=5, help="page loads per strategy")
+    parser.add_argument("--latency", type=float, default=0.3,
+                        help="seconds each result page request takes")
+    parser.add_argument("--pages", type=int, default=3, help="result pages the fixture serves")
+    args = parser.parse_args()
+
+    server = serve_fixtures(args.latency)
+    url = (f"http://127.0.0.1:{server.server_port}/linkedin_jobs_search.html"
+           f"?pages={args.pages}")
+    strategies = [("fixed sleeps", load_with_sleeps), ("content waits", load_job_search_page)]
+    timings = {name: [] for name, _ in strategies}
+    try:
+        with managed_driver() as driver:
+            for run in range(args.runs):
+                for name, load in strategies:
+                    started = time.monotonic()
+                    with page_timer(f"{name}, run {run + 1}"):
+                        cards = load(driver, url)
+                    timings[name].append(time.monotonic() - started)
+                    links = {card["link"] for card in extract_job_cards(driver)}
+                    print(f"  {cards} cards, {len(links)} distinct links")
+    finally:
+        server.shutdown()
+
+    for name, samples in timings.items():
+        print(f"{name:>14}: mean {sum(samples) / len(samples):.2f}s, "
+              f"min {min(samples):.2f}s, max {max(samples):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
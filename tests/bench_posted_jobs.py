@@ -0,0 +1,102 @@
+"""
+Benchmark how job_post.py's startup scales with the posted-jobs history.
+
+For each history size a synthetic posted_jobs.jsonl is written and one run
+builds the Bloom filter and SQLite index. Fresh processes then import job_post,
+open a TwitterJobPoster and check a scrape's worth of links (some already
+posted), reporting wall time and peak RSS; both should stay flat as the history
+grows.
+
+    python tests/bench_posted_jobs.py --sizes 1000 10000000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import sys, json, time, resource
+start = time.perf_counter()
+from job_post import TwitterJobPoster
+poster = TwitterJobPoster()
+opened = time.perf_counter()
+posted = poster.find_posted_links(json.loads(sys.argv[1]))
+checked = time.perf_counter()
+poster.close()
+print(json.dumps({
+    "startup": opened - start,
+    "check": checked - opened,
+    "posted": len(posted),
+    "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+
+def job_link(job_id):
+    return f"https://www.linkedin.com/jobs/view/{job_id}/"
+
+
+def write_history(path, size):
+    """Write a journal of `size` posted jobs with ids 1..size."""
+    with open(path, "w", encoding="utf-8") as f:
+        for job_id in range(1, size + 1):
+            f.write(json.dumps({
+                "job_link": job_link(job_id),
+                "job_title": f"Software Engineer {job_id % 97}",
+                "company_name": f"Company {job_id % 500}",
+                "tweet_id": str(1790000000000000000 + job_id),
+                "posted_at": "2024-05-02T10:00:00",
+            }) + "\n")
+
+
+def run_child(workdir, links):
+    """Run one job_post startup in a fresh process and return its measurements."""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, json.dumps(links)],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def bench(size, runs, posted, new):
+    with tempfile.TemporaryDirectory() as workdir:
+        write_history(os.path.join(workdir, "posted_jobs.jsonl"), size)
+        # Already posted links spread over the history, plus never-posted ones
+        step = max(1, size // posted)
+        links = [job_link(job_id) for job_id in range(1, size + 1, step)][:posted]
+        links += [job_link(size + 1 + i) for i in range(new)]
+
+        start = time.perf_counter()
+        first = run_child(workdir, links)
+        build = time.perf_counter() - start
+
+        samples = [run_child(workdir, links) for _ in range(runs)]
+        assert all(sample["posted"] == min(posted, size) for sample in samples + [first])
+
+    startup = min(sample["startup"] for sample in samples)
+    check = min(sample["check"] for sample in samples)
+    rss = max(sample["rss_kb"] for sample in samples)
+    print(f"{size:>12,} {build:>12.2f} {startup * 1000:>11.1f} {check * 1000:>9.2f} "
+          f"{rss / 1024:>9.1f}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job_post startup against history size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000_000])
+    parser.add_argument("--runs", type=int, default=5, help="measured startups per size")
+    parser.add_argument("--posted", type=int, default=50, help="already posted links checked")
+    parser.add_argument("--new", type=int, default=450, help="never posted links checked")
+    args = parser.parse_args()
+
+    print(f"{'history':>12} {'build (s)':>12} {'startup ms':>11} {'check ms':>9} {'RSS MB':>9}")
+    for size in args.sizes:
+        bench(size, args.runs, args.posted, args.new)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Measure what importing scrape_linkedinjobs costs: wall time, the interpreter's
+peak RSS and the RSS of any processes (Chrome, chromedriver) the import left
+running. Pass --ref to measure the module as it was at another git revision,
+e.g. before the import-time driver launch was removed:
+
+    python tests/bench_scraper_startup.py
+    python tests/bench_scraper_startup.py --ref ab1b47b
+
+The older revision needs Chrome and chromedriver, since importing it starts a
+browser.
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import os, sys, json, time, resource
+start = time.perf_counter()
+error = None
+try:
+    from scrape_linkedinjobs import extract_job_data
+except BaseException as e:
+    error = f"{type(e).__name__}: {e}"
+elapsed = time.perf_counter() - start
+
+def descendants(pid):
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+            children.extend(descendants(int(entry)))
+    return children
+
+def rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+children = descendants(os.getpid())
+print(json.dumps({
+    "import_s": elapsed,
+    "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "children": len(children),
+    "children_rss_kb": sum(rss_kb(pid) for pid in children),
+    "error": error,
+}))
+sys.stdout.flush()
+# Older revisions left a browser open in a module global
+driver = getattr(sys.modules.get("scrape_linkedinjobs"), "driver", None)
+if driver is not None:
+    driver.quit()
+os._exit(0)
+"""
+
+
+def run_import(module_dir, use_module_dir, runs):
+    path = [module_dir, REPO_ROOT] if use_module_dir else [REPO_ROOT]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path))
+    samples = []
+    for _ in range(runs):
+        # Not run from the repo, whose copy would shadow the one under test
+        result = subprocess.run([sys.executable, "-c", CHILD], cwd=module_dir, env=env,
+                                capture_output=True, text=True, timeout=120)
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure scrape_linkedinjobs import cost.")
+    parser.add_argument("--ref", help="git revision to take scrape_linkedinjobs.py from")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as module_dir:
+        if args.ref:
+            source = subprocess.run(
+                ["git", "show", f"{args.ref}:scrape_linkedinjobs.py"],
+                cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+            with open(os.path.join(module_dir, "scrape_linkedinjobs.py"), "w") as f:
+                f.write(source)
+        samples = run_import(module_dir, bool(args.ref), args.runs)
+
+    label = args.ref or "working tree"
+    errors = {sample["error"] for sample in samples if sample["error"]}
+    if errors:
+        print(f"{label}: import failed: {'; '.join(error.strip() for error in errors)}")
+    print(f"{label}: import {min(s['import_s'] for s in samples) * 1000:.0f} ms (best of {args.runs}), "
+          f"peak RSS {max(s['peak_rss_kb'] for s in samples) / 1024:.1f} MB, "
+          f"{max(s['children'] for s in samples)} child processes holding "
+          f"{max(s['children_rss_kb'] for s in samples) / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from job_card_parser import clean_job_link, parse_job_cards
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_parses_guest_job_search_response():
+    html = (FIXTURES / "linkedin_guest_jobs.html").read_text(encoding="utf-8")
+
+    assert parse_job_cards(html) == [
+        {
+            "title": "Software Engineer II",
+            "link": "https://www.linkedin.com/jobs/view/3912345678/",
+            "company": "Microsoft",
+            "location": "Bengaluru, Karnataka, India",
+        },
+        {
+            "title": "Data Scientist - Research & Analytics",
+            "link": "https://www.linkedin.com/jobs/view/3908765432/",
+            "company": "Microsoft",
+            "location": "Hyderabad, Telangana, India",
+        },
+        {
+            "title": "Senior Product Manager",
+            "link": "https://www.linkedin.com/jobs/view/3901112223/",
+            "company": "Microsoft",
+            "location": "Noida, Uttar Pradesh, India",
+        },
+    ]
+
+
+def test_empty_page_has_no_cards():
+    assert parse_job_cards("") == []
+    assert parse_job_cards("<li></li>") == []
+
+
+def test_clean_job_link_drops_tracking_parameters():
+    assert clean_job_link("https://www.linkedin.com/jobs/view/123?refId=abc&trk=x") == \
+        "https://www.linkedin.com/jobs/view/123/"
+
+
+def test_same_job_gets_same_link_from_either_fetcher():
+    html = (FIXTURES / "linkedin_guest_jobs.html").read_text(encoding="utf-8")
+    guest_link = parse_job_cards(html)[0]["link"]
+
+    # href of the logged-in search page's a.job-card-container__link
+    selenium_link = clean_job_link(
+        "https://www.linkedin.com/jobs/view/3912345678/"
+        "?eBP=CwEAAAGP&refId=k3pQ7dWQ8Q1xv4f3yB0wQw%3D%3D&trackingId=Zt7q1cG0yCq0Jm7b0wM1rA%3D%3D")
+    assert guest_link == selenium_link == "https://www.linkedin.com/jobs/view/3912345678/"
+
+
+def test_clean_job_link_finds_job_id_in_query_or_urn():
+    assert clean_job_link("https://www.linkedin.com/jobs/search/?currentJobId=42&f_C=1") == \
+        "https://www.linkedin.com/jobs/view/42/"
+    assert clean_job_link("", "urn:li:jobPosting:3901112223") == \
+        "https://www.linkedin.com/jobs/view/3901112223/"
+    assert clean_job_link("https://www.linkedin.com/company/microsoft?trk=x") == \
+        "https://www.linkedin.com/company/microsoft"
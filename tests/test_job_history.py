@@ -0,0 +1,135 @@
+import json
+import os
+
+from job_history import PostedJobsJournal, PostedJobsIndex, PostedJobsBloom
+
+
+def record(job_id):
+    return {"job_link": f"https://www.linkedin.com/jobs/view/{job_id}/", "job_title": "Engineer"}
+
+
+def link(job_id):
+    return record(job_id)["job_link"]
+
+
+def make_journal(tmp_path, **kwargs):
+    return PostedJobsJournal(path=str(tmp_path / "posted_jobs.jsonl"),
+                             legacy_path=str(tmp_path / "posted_jobs.json"), **kwargs)
+
+
+def journal_lines(tmp_path):
+    return (tmp_path / "posted_jobs.jsonl").read_text(encoding="utf-8").splitlines()
+
+
+def open_index(journal, tmp_path):
+    return PostedJobsIndex(journal, path=str(tmp_path / "posted_jobs.index.sqlite3")).open()
+
+
+def test_index_confirms_posted_links(tmp_path):
+    journal = make_journal(tmp_path)
+    for job_id in (1, 2, 3):
+        journal.append(record(job_id))
+    journal.close()
+
+    index = open_index(journal, tmp_path)
+    assert index.find([link(2), link(3), link(4)]) == {link(2), link(3)}
+    assert index.find([]) == set()
+
+
+def test_index_catches_up_with_appends_and_rebuilds_for_a_new_journal(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.append(record(1))
+    journal.close()
+    open_index(journal, tmp_path).close()
+
+    # Appended by another process while the index was closed
+    journal.append(record(2))
+    journal.close()
+    index = open_index(journal, tmp_path)
+    assert index.find([link(1), link(2)]) == {link(1), link(2)}
+    index.close()
+
+    # Replaced wholesale, as compaction and migration do
+    replacement = tmp_path / "replacement.jsonl"
+    replacement.write_text(json.dumps(record(2)) + "\n", encoding="utf-8")
+    os.replace(replacement, tmp_path / "posted_jobs.jsonl")
+    index = open_index(journal, tmp_path)
+    assert index.find([link(1), link(2)]) == {link(2)}
+
+
+def test_index_add_is_seen_after_reopen(tmp_path):
+    journal = make_journal(tmp_path)
+    index = open_index(journal, tmp_path)
+    journal.append(record(7))
+    index.add(link(7))
+    index.close()
+    journal.close()
+
+    assert open_index(journal, tmp_path).find([link(7)]) == {link(7)}
+
+
+def test_bloom_has_no_false_negatives_and_few_false_positives(tmp_path):
+    journal = make_journal(tmp_path)
+    for job_id in range(5000):
+        journal.append(record(job_id))
+    journal.close()
+
+    bloom = PostedJobsBloom(journal, path=str(tmp_path / "posted_jobs.bloom"),
+                            capacity=5000, error_rate=0.01).open()
+    assert all(bloom.might_contain(link(job_id)) for job_id in range(5000))
+    false_positives = sum(bloom.might_contain(link(job_id)) for job_id in range(5000, 25000))
+    assert false_positives < 20000 * 0.02
+
+
+def test_legacy_json_history_is_migrated_once(tmp_path):
+    legacy = tmp_path / "posted_jobs.json"
+    legacy.write_text(json.dumps({"posted_jobs": [record(1), record(2)]}), encoding="utf-8")
+    journal = make_journal(tmp_path)
+
+    journal.migrate()
+    assert [json.loads(line) for line in journal_lines(tmp_path)] == [record(1), record(2)]
+    assert not legacy.exists()
+    assert (tmp_path / "posted_jobs.json.migrated").exists()
+
+    # A legacy file reappearing later never overwrites the journal
+    legacy.write_text(json.dumps({"posted_jobs": [record(3)]}), encoding="utf-8")
+    journal.migrate()
+    assert list(journal.iter_links()) == [link(1), link(2)]
+
+
+def test_torn_last_line_is_skipped_and_terminated_before_the_next_append(tmp_path):
+    path = tmp_path / "posted_jobs.jsonl"
+    path.write_text(json.dumps(record(1)) + "\n" + '{"job_link": "https://www.linkedin.co',
+                    encoding="utf-8")
+    journal = make_journal(tmp_path)
+
+    assert list(journal.iter_links()) == [link(1)]
+
+    journal.append(record(2))
+    journal.close()
+    assert len(journal_lines(tmp_path)) == 3
+    assert list(journal.iter_links()) == [link(1), link(2)]
+    assert list(journal.iter_lines()) == [link(1), None, link(2)]
+
+
+def test_journal_is_compacted_once_stale_lines_pile_up(tmp_path):
+    journal = make_journal(tmp_path, compact_min_waste=2)
+    for job_id in (1, 2, 1, 3):
+        journal.append(record(job_id))
+    journal.close()
+    index = open_index(journal, tmp_path)
+    assert (index.live_lines, index.stale_lines) == (3, 1)
+    assert len(journal_lines(tmp_path)) == 4
+    index.close()
+
+    # A crash mid-append leaves a torn line, which the next append terminates
+    with open(tmp_path / "posted_jobs.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"job_link": "https://www.linkedin.co')
+    journal.append(record(4))
+    journal.close()
+
+    index = open_index(journal, tmp_path)
+    assert (index.live_lines, index.stale_lines) == (4, 0)
+    assert [json.loads(line) for line in journal_lines(tmp_path)] == \
+        [record(1), record(2), record(3), record(4)]
+    assert index.find([link(n) for n in range(1, 6)]) == {link(1), link(2), link(3), link(4)}
@@ -0,0 +1,49 @@
+import pytest
+
+job_post = pytest.importorskip("job_post")
+
+from rate_limiter import PostingScheduler
+
+
+class FakeResponse:
+    def __init__(self, tweet_id):
+        self.data = {"id": tweet_id}
+
+
+class FakeClient:
+    def __init__(self):
+        self.tweets = []
+
+    def create_tweet(self, text, in_reply_to_tweet_id=None):
+        self.tweets.append(text)
+        return FakeResponse(str(len(self.tweets)))
+
+
+def make_job(job_id, company):
+    return {"title": f"Job {job_id}", "company": company,
+            "link": f"https://www.linkedin.com/jobs/view/{job_id}/"}
+
+
+def test_only_jobs_the_selector_reads_are_checked(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client = FakeClient()
+    monkeypatch.setattr(job_post, "get_client", lambda: client)
+    monkeypatch.setattr(job_post, "get_scheduler", lambda: PostingScheduler(rate=1000, burst=100))
+    poster = job_post.TwitterJobPoster()
+    jobs = [make_job(job_id, f"Company {job_id % 100}") for job_id in range(10_000)]
+    for job in jobs[:3]:
+        poster._save_posted_job(job, "0")
+    poster.checked_job_links.clear()
+
+    checked = []
+    might_contain = poster.posted_jobs_bloom.might_contain
+    poster.posted_jobs_bloom.might_contain = lambda link: checked.append(link) or might_contain(link)
+    try:
+        assert poster.post_jobs_to_twitter(jobs, max_jobs=5) == 5
+    finally:
+        poster.close()
+
+    # Three posted jobs skipped, then five new ones from different companies
+    assert checked == [job["link"] for job in jobs[:8]]
+    assert [tweet.splitlines()[-1] for tweet in client.tweets[1:]] == \
+        [job["link"] for job in jobs[3:8]]
@@ -0,0 +1,60 @@
+import random
+from collections import defaultdict
+
+from job_selection import select_diverse_jobs
+
+
+def two_pass_selection(new_jobs, max_jobs):
+    """The selection post_jobs_to_twitter made before select_diverse_jobs."""
+    company_jobs = defaultdict(list)
+    for job in new_jobs:
+        company_jobs[job['company']].append(job)
+
+    filtered_jobs = []
+    companies_used = set()
+    for company, company_job_list in company_jobs.items():
+        if len(filtered_jobs) >= max_jobs:
+            break
+        if company not in companies_used:
+            filtered_jobs.append(company_job_list[0])
+            companies_used.add(company)
+
+    for company, company_job_list in company_jobs.items():
+        if len(filtered_jobs) >= max_jobs:
+            break
+        if len(company_job_list) > 1 and company in companies_used:
+            filtered_jobs.append(company_job_list[1])
+    return filtered_jobs
+
+
+def random_jobs(rng):
+    companies = [f"Company {i}" for i in range(rng.randint(1, 8))]
+    return [
+        {"title": f"Job {i}", "link": f"https://www.linkedin.com/jobs/view/{i}/",
+         "company": rng.choice(companies)}
+        for i in range(rng.randint(0, 30))
+    ]
+
+
+def test_matches_two_pass_selection():
+    for seed in range(3000):
+        rng = random.Random(seed)
+        jobs = random_jobs(rng)
+        max_jobs = rng.randint(1, 12)
+
+        assert list(select_diverse_jobs(iter(jobs), max_jobs)) == \
+            two_pass_selection(jobs, max_jobs), f"seed {seed}"
+
+
+def test_stops_reading_once_max_jobs_is_reached():
+    read = []
+
+    def jobs():
+        for i in range(10_000):
+            read.append(i)
+            yield {"title": f"Job {i}", "company": f"Company {i % 100}"}
+
+    selected = list(select_diverse_jobs(jobs(), 5))
+
+    assert [job["title"] for job in selected] == [f"Job {i}" for i in range(5)]
+    assert len(read) == 5
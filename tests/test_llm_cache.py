@@ -0,0 +1,66 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from llm_cache import LLMCache
+
+
+class FakeClient:
+    """Stands in for the Groq client, answering with queued responses."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        content = self.responses.pop(0)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(total_tokens=10),
+        )
+
+
+def require_object(content):
+    if not isinstance(json.loads(content), dict):
+        raise ValueError("not an object")
+
+
+def complete(cache, client, **kwargs):
+    return cache.complete(client, "prompt", model="m", temperature=0.5, max_tokens=10, **kwargs)
+
+
+def test_invalid_response_is_not_cached(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"))
+    client = FakeClient("[1, 2]", '{"ok": true}')
+
+    with pytest.raises(ValueError):
+        complete(cache, client, validate=require_object)
+
+    assert complete(cache, client, validate=require_object) == '{"ok": true}'
+    assert complete(cache, client, validate=require_object) == '{"ok": true}'
+    assert client.calls == 2
+
+
+def test_cached_response_failing_validation_is_a_miss(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"))
+    client = FakeClient("not json", '{"ok": true}')
+
+    assert complete(cache, client) == "not json"
+    assert complete(cache, client, validate=require_object) == '{"ok": true}'
+    assert complete(cache, client, validate=require_object) == '{"ok": true}'
+    assert client.calls == 2
+
+
+def test_fresh_calls_are_not_counted_as_lookups(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"))
+    client = FakeClient("a", "b")
+
+    complete(cache, client, fresh=True)
+    assert complete(cache, client) == "a"
+    complete(cache, client, fresh=True)
+
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert cache.summary().startswith("LLM cache: 1/1 hits")
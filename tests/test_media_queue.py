@@ -0,0 +1,58 @@
+from media_queue import MediaQueue
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_peek_keeps_entry_until_removed(tmp_path):
+    queue = MediaQueue(str(tmp_path / "media.json"), expiry_margin=10, clock=FakeClock())
+    queue.add("first", 5000, "text 1")
+    queue.add("second", 5000, "text 2")
+
+    assert queue.peek()["media_id"] == "first"
+    assert queue.peek()["media_id"] == "first"
+    assert len(queue) == 2
+
+    queue.remove(queue.peek())
+    assert queue.peek()["media_id"] == "second"
+
+
+def test_expired_entries_are_evicted(tmp_path):
+    clock = FakeClock()
+    queue = MediaQueue(str(tmp_path / "media.json"), expiry_margin=10, clock=clock)
+    queue.add("soon", 1100, "text")
+    queue.add("later", 5000, "text")
+
+    clock.now = 1095
+    assert queue.peek()["media_id"] == "later"
+    assert len(queue) == 1
+
+
+def test_expired_entry_with_archived_image_is_refreshed(tmp_path):
+    image = tmp_path / "meme.png"
+    image.write_bytes(b"png")
+    uploads = []
+
+    def refresh(path):
+        uploads.append(path)
+        return "fresh", 9000
+
+    clock = FakeClock()
+    queue = MediaQueue(str(tmp_path / "media.json"), expiry_margin=10,
+                       refresh=refresh, clock=clock)
+    queue.add("stale", 1100, "text", path=str(image))
+
+    clock.now = 1095
+    assert len(queue) == 1
+    assert uploads == []
+
+    entry = queue.peek()
+    assert entry["media_id"] == "fresh"
+    assert entry["expires_at"] == 9000
+    assert uploads == [str(image)]
+    assert MediaQueue(str(tmp_path / "media.json"), clock=clock).peek()["media_id"] == "fresh"
@@ -0,0 +1,84 @@
+import argparse
+import time
+
+import pytest
+
+tweepy = pytest.importorskip("tweepy")
+meme_post = pytest.importorskip("meme_post")
+
+from media_queue import MediaQueue
+from rate_limiter import RateLimitTimeout
+
+
+class FakeResponse:
+    status_code = 400
+    reason = "Bad Request"
+    text = ""
+
+    def json(self):
+        return {"errors": [{"message": "Your media IDs are invalid."}]}
+
+
+class FakeTwitter:
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.posted = []
+
+    def post_with_media_id(self, tweet_text, media_id):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.posted.append(media_id)
+        return "1790000000000000000"
+
+    def preupload(self, image):
+        raise AssertionError("nothing should be uploaded")
+
+
+def make_queue(tmp_path, *media_ids):
+    queue = MediaQueue(str(tmp_path / "media_queue.json"))
+    for media_id in media_ids:
+        queue.add(media_id, time.time() + 3600, f"text for {media_id}")
+    return queue
+
+
+def test_rejected_upload_is_dropped_and_next_one_posted(tmp_path):
+    queue = make_queue(tmp_path, "stale", "good")
+    twitter = FakeTwitter([tweepy.errors.BadRequest(FakeResponse())])
+
+    assert meme_post.post_preloaded_meme(twitter, queue) == meme_post.PRELOAD_POSTED
+    assert twitter.posted == ["good"]
+    assert len(queue) == 0
+
+
+def test_transient_failure_blocks_and_keeps_the_queue(tmp_path):
+    queue = make_queue(tmp_path, "first")
+    twitter = FakeTwitter([RateLimitTimeout("quota resets in 900s")])
+
+    assert meme_post.post_preloaded_meme(twitter, queue) == meme_post.PRELOAD_BLOCKED
+    assert queue.peek()["media_id"] == "first"
+
+
+def test_empty_queue(tmp_path):
+    assert meme_post.post_preloaded_meme(FakeTwitter(), make_queue(tmp_path)) == \
+        meme_post.PRELOAD_EMPTY
+
+
+def test_main_stops_without_generating_when_posting_is_blocked(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    queue = make_queue(tmp_path, "first")
+    generated = []
+    monkeypatch.setattr(meme_post, "MemeGenerator", lambda archive: object())
+    monkeypatch.setattr(meme_post, "HashtagGenerator", lambda: object())
+    monkeypatch.setattr(meme_post, "TwitterPoster",
+                        lambda: FakeTwitter([RateLimitTimeout("quota resets in 900s")]))
+    monkeypatch.setattr(meme_post, "MediaQueue", lambda refresh: queue)
+    monkeypatch.setattr(meme_post, "generate_all_memes",
+                        lambda *args, **kwargs: generated.append(args) or [])
+    monkeypatch.setattr(meme_post, "generate_memes_lazily",
+                        lambda *args, **kwargs: generated.append(args) or [])
+
+    meme_post.main(argparse.Namespace(
+        pipeline="batch", lazy=False, buffer=1, archive=False, preload=2))
+
+    assert generated == []
+    assert queue.peek()["media_id"] == "first"
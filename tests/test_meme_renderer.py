@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+from PIL import ImageChops, ImageDraw
+
+meme_generator = pytest.importorskip("meme_generator")
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), "..", "fonts", "DejaVuSans-Bold.ttf")
+CAPTION = "Resume bana liya, ab job kab milegi?"
+
+
+def render_line(single_pass_outline, font_size, stroke_width):
+    renderer = meme_generator.MemeRenderer(FONT_PATH, single_pass_outline)
+    img = Image.new("RGB", (1400, 220), (90, 140, 200))
+    font = meme_generator.load_font(FONT_PATH, font_size)
+    renderer._draw_text_with_outline(ImageDraw.Draw(img), CAPTION, 40, 40, font, stroke_width)
+    return img
+
+
+# Font sizes paired with the stroke width MemeRenderer.render picks for them
+@pytest.mark.parametrize("font_size", [75, 96, 120])
+def test_single_pass_outline_matches_legacy_outline(font_size):
+    stroke_width = max(2, int(font_size * 0.04))
+    diff = ImageChops.difference(
+        render_line(True, font_size, stroke_width), render_line(False, font_size, stroke_width))
+
+    assert diff.getbbox() is None
+
+
+@pytest.mark.parametrize("font_size", [48, 60, 74])
+def test_thin_outline_differs_only_on_antialiased_edges(font_size):
+    diff = ImageChops.difference(render_line(True, font_size, 2), render_line(False, font_size, 2))
+
+    assert max(high for _, high in diff.getextrema()) <= 8
@@ -0,0 +1,134 @@
+from types import SimpleNamespace
+
+import pytest
+
+from rate_limiter import PostingScheduler, RateLimitTimeout
+
+
+class FakeTime:
+    """Clock and sleep for the scheduler; sleeping advances the clock."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RateLimited(Exception):
+    """What a client raises for a 429 from the fake endpoint."""
+
+    def __init__(self, headers=None):
+        super().__init__("429 Too Many Requests")
+        self.response = SimpleNamespace(status_code=429, headers=headers or {})
+
+
+def make_scheduler(fake, **kwargs):
+    kwargs.setdefault("base_backoff", 5.0)
+    return PostingScheduler(clock=fake.clock, sleep=fake.sleep, **kwargs)
+
+
+def response(remaining, reset_at, prefix="x-rate-limit"):
+    return SimpleNamespace(headers={
+        f"{prefix}-remaining": str(remaining),
+        f"{prefix}-reset": str(reset_at),
+    })
+
+
+def test_bucket_spaces_posts_after_burst():
+    fake = FakeTime()
+    scheduler = make_scheduler(fake, rate=0.5, burst=2)
+
+    for _ in range(3):
+        scheduler.acquire()
+
+    assert fake.sleeps == [2.0]
+
+
+def test_spent_quota_waits_for_reset():
+    fake = FakeTime()
+    scheduler = make_scheduler(fake, rate=10, burst=10)
+    scheduler.observe_response(response(0, fake.now + 120))
+
+    scheduler.acquire()
+
+    assert sum(fake.sleeps) == pytest.approx(120)
+
+
+def test_acquire_raises_instead_of_waiting_past_max_wait():
+    fake = FakeTime()
+    scheduler = make_scheduler(fake, max_wait=900)
+    scheduler.observe_response(
+        response(0, fake.now + 20 * 3600, prefix="x-user-limit-24hour"))
+
+    with pytest.raises(RateLimitTimeout):
+        scheduler.acquire()
+    assert fake.sleeps == []
+
+
+def test_call_retries_429_until_success():
+    fake = FakeTime()
+    scheduler = make_scheduler(fake, rate=10, burst=10)
+    outcomes = [RateLimited({"x-rate-limit-remaining": "0",
+                             "x-rate-limit-reset": str(fake.now + 30)}), "posted"]
+
+    def create_tweet():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert scheduler.call(create_tweet) == "posted"
+    # The jittered backoff is absorbed by the wait for the reported reset
+    assert sum(fake.sleeps) == pytest.approx(30)
+
+
+def test_call_gives_up_when_backoff_exceeds_max_wait():
+    fake = FakeTime()
+    scheduler = make_scheduler(fake, rate=10, burst=10, max_wait=60, max_retries=5)
+
+    def create_tweet():
+        raise RateLimited({"x-app-limit-24hour-remaining": "0",
+                           "x-app-limit-24hour-reset": str(fake.now + 86400)})
+
+    with pytest.raises(RateLimitTimeout):
+        scheduler.call(create_tweet)
+    assert sum(fake.sleeps) <= 60
+
+
+def test_non_rate_limit_errors_are_not_retried():
+    fake = FakeTime()
+    scheduler = make_scheduler(fake)
+    calls = []
+
+    def create_tweet():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        scheduler.call(create_tweet)
+    assert len(calls) == 1
+
+
+def test_only_observed_endpoints_update_the_quota():
+    fake = FakeTime()
+    scheduler = make_scheduler(
+        fake, rate=10, burst=10, observed_endpoints=[("POST", "/2/tweets")])
+
+    upload = response(0, fake.now + 600)
+    upload.request = SimpleNamespace(
+        method="POST", url="https://upload.twitter.com/1.1/media/upload.json")
+    scheduler.observe_response(upload)
+    scheduler.acquire()
+    assert fake.sleeps == []
+
+    tweet = response(0, fake.now + 600)
+    tweet.request = SimpleNamespace(method="POST", url="https://api.twitter.com/2/tweets")
+    scheduler.observe_response(tweet)
+    scheduler.acquire()
+    assert sum(fake.sleeps) == pytest.approx(600)
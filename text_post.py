@@ -1,6 +1,8 @@
 import os
 from groq import Groq
-import tweepy
+from llm_cache import get_llm_cache
+from rate_limiter import get_scheduler
+from twitter_client import get_client, connection_summary
 from dotenv import load_dotenv
 import random
 
@@ -12,6 +14,8 @@ class TweetGenerator:
         try:
             print("Initializing TweetGenerator...")
             self.groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+            self.llm_cache = get_llm_cache()
+            self.scheduler = get_scheduler()
             self._initialize_twitter()
             print("Initialization complete.")
         except Exception as e:
@@ -20,29 +24,14 @@ class TweetGenerator:
     def _initialize_twitter(self):
         try:
             print("Initializing Twitter API credentials...")
-            self.api_key = os.getenv('TWITTER_API_KEY')
-            self.api_secret_key = os.getenv('TWITTER_API_SECRET_KEY')
-            self.access_token = os.getenv('TWITTER_ACCESS_TOKEN')
-            self.access_token_secret = os.getenv('TWITTER_ACCESS_TOKEN_SECRET')
-            self.bearer_token = os.getenv('TWITTER_BEARER_TOKEN')
-
-            if not all([self.api_key, self.api_secret_key, self.access_token,
-                        self.access_token_secret, self.bearer_token]):
-                raise ValueError(
-                    "Missing required Twitter API credentials in .env file")
-
-            self.client = tweepy.Client(
-                bearer_token=self.bearer_token,
-                consumer_key=self.api_key,
-                consumer_secret=self.api_secret_key,
-                access_token=self.access_token,
-                access_token_secret=self.access_token_secret
-            )
+            self.client = get_client()
             print("Twitter API initialized successfully.")
         except Exception as e:
             print(f"Error initializing Twitter API: {str(e)}")
 
-    def generate_tweet_content(self):
+    def generate_tweet_content(self, fresh=True):
+        # Fresh by default: Twitter rejects duplicate statuses, so a cached tweet
+        # for a repeated topic could never be posted. Pass fresh=False to reuse.
         topics = [
             "resume optimization",
             "job interview tips",
@@ -97,14 +86,14 @@ class TweetGenerator:
 
         try:
             print("Generating tweet content via Groq API...")
-            chat_completion = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
+            response = self.llm_cache.complete(
+                self.groq_client,
+                prompt,
                 model="llama-3.2-3b-preview",
                 temperature=0.7,
                 max_tokens=200,
-            )
-
-            response = chat_completion.choices[0].message.content.strip()
+                fresh=fresh,
+            ).strip()
             print(f"\nRaw response from Groq:\n{response}")
 
             # More robust parsing
@@ -146,7 +135,7 @@ class TweetGenerator:
 
         try:
             print("\nPosting tweet to Twitter...")
-            response = self.client.create_tweet(text=tweet_content)
+            response = self.scheduler.call(self.client.create_tweet, text=tweet_content)
             tweet_id = response.data.get('id')
             if tweet_id:
                 print(f"Tweet posted successfully! Tweet ID: {tweet_id}")
@@ -163,6 +152,8 @@ def main():
     print("Starting tweet posting process...")
     tweet_gen = TweetGenerator()
     success = tweet_gen.post_tweet()
+    print(get_llm_cache().summary())
+    print(connection_summary())
 
     if success:
         print("Tweet posting process completed successfully.")
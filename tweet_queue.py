@@ -0,0 +1,99 @@
+import os
+import json
+import uuid
+from datetime import datetime
+
+
+class TweetQueue:
+    """
+    Durable on-disk queue of tweet threads waiting to be posted.
+
+    Each thread is one JSON file holding its tweets, the id of every tweet
+    already posted and the `parent_tweet_id` the next reply attaches to. The
+    file is rewritten atomically after every posted tweet, so a poster that
+    dies halfway through a thread resumes at the next unposted tweet instead of
+    starting a new head tweet.
+    """
+
+    def __init__(self, queue_dir="queue"):
+        """
+        Initialize the queue and create its directory.
+
+        Args:
+            queue_dir (str): Directory holding one JSON file per pending thread
+        """
+        self.queue_dir = queue_dir
+        os.makedirs(queue_dir, exist_ok=True)
+
+    def enqueue(self, tweets):
+        """
+        Add a thread to the queue.
+
+        Args:
+            tweets (list): Dicts with 'text' and optional 'job'; the first one is
+                the head tweet and the rest are posted as a reply chain
+
+        Returns:
+            dict: The stored thread
+        """
+        thread = {
+            "id": f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}",
+            "created_at": datetime.now().isoformat(),
+            "parent_tweet_id": None,
+            "attempts": 0,
+            "tweets": [
+                {"text": tweet["text"], "job": tweet.get("job"), "tweet_id": None, "failed": False}
+                for tweet in tweets
+            ],
+        }
+        self.save(thread)
+        return thread
+
+    def pending(self):
+        """Return every queued thread, oldest first."""
+        threads = []
+        for name in sorted(os.listdir(self.queue_dir)):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.queue_dir, name), "r", encoding="utf-8") as f:
+                    threads.append(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"Skipping unreadable queued thread {name}: {e}")
+        return threads
+
+    def pending_job_links(self):
+        """Return links of queued jobs that have not been posted yet."""
+        return {
+            tweet["job"]["link"]
+            for thread in self.pending()
+            for tweet in thread["tweets"]
+            if tweet.get("job") and not tweet["tweet_id"]
+        }
+
+    def save(self, thread):
+        """Atomically persist a thread's progress."""
+        path = self._path(thread)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(thread, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def complete(self, thread):
+        """Remove a finished thread from the queue."""
+        try:
+            os.remove(self._path(thread))
+        except FileNotFoundError:
+            pass
+
+    def dead_letter(self, thread):
+        """Move a thread that cannot be posted out of the queue, into `failed/`."""
+        failed_dir = os.path.join(self.queue_dir, "failed")
+        os.makedirs(failed_dir, exist_ok=True)
+        self.save(thread)
+        os.replace(self._path(thread), os.path.join(failed_dir, f"{thread['id']}.json"))
+
+    def _path(self, thread):
+        return os.path.join(self.queue_dir, f"{thread['id']}.json")
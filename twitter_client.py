@@ -0,0 +1,106 @@
+import os
+import threading
+import requests
+import tweepy
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from rate_limiter import get_scheduler
+
+load_dotenv()
+
+_lock = threading.Lock()
+_session = None
+_client = None
+_media_api = None
+_request_count = 0
+
+
+def get_twitter_credentials():
+    """
+    Read the Twitter API credentials from the environment.
+
+    Raises:
+        ValueError: If any credential is missing
+    """
+    credentials = {
+        "consumer_key": os.getenv('TWITTER_API_KEY'),
+        "consumer_secret": os.getenv('TWITTER_API_SECRET_KEY'),
+        "access_token": os.getenv('TWITTER_ACCESS_TOKEN'),
+        "access_token_secret": os.getenv('TWITTER_ACCESS_TOKEN_SECRET'),
+        "bearer_token": os.getenv('TWITTER_BEARER_TOKEN'),
+    }
+    if not all(credentials.values()):
+        raise ValueError("Missing required Twitter API credentials in .env file")
+    return credentials
+
+
+def get_session(pool_size=10):
+    """
+    Return the process-wide HTTP session shared by every Twitter client.
+
+    Its keep-alive pool is sized for concurrent posting, so the v2 client and the
+    v1.1 media API reuse open TLS connections instead of handshaking per call.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.hooks["response"].append(_count_request)
+            _session = session
+        return _session
+
+
+def get_client():
+    """Return the shared tweepy v2 Client, creating it on first use."""
+    global _client
+    session = get_session()
+    with _lock:
+        if _client is None:
+            client = tweepy.Client(**get_twitter_credentials())
+            client.session = session
+            _client = get_scheduler().attach(client)
+        return _client
+
+
+def get_media_api():
+    """
+    Return the shared tweepy v1.1 API used for media uploads.
+
+    Built lazily, so scripts that never upload media skip the v1.1 auth setup.
+    """
+    global _media_api
+    session = get_session()
+    with _lock:
+        if _media_api is None:
+            credentials = get_twitter_credentials()
+            auth = tweepy.OAuth1UserHandler(
+                credentials["consumer_key"],
+                credentials["consumer_secret"],
+                credentials["access_token"],
+                credentials["access_token_secret"]
+            )
+            api = tweepy.API(auth)
+            api.session = session
+            _media_api = get_scheduler().attach(api)
+        return _media_api
+
+
+def connection_summary():
+    """Describe how many requests reused pooled connections, for the run summary."""
+    if _session is None:
+        return "Twitter HTTP: no requests made"
+    connections = 0
+    for adapter in _session.adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            connections += getattr(pools[key], "num_connections", 0)
+    return f"Twitter HTTP: {_request_count} requests over {connections} new connections"
+
+
+def _count_request(response, *args, **kwargs):
+    """Response hook counting requests sent through the shared session."""
+    global _request_count
+    _request_count += 1
+    return response